@@ -1,36 +1,96 @@
-from fastapi import Depends, FastAPI, Query, HTTPException
+from contextlib import asynccontextmanager
+from fastapi import APIRouter, Depends, FastAPI, Query, HTTPException, Request, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from starlette.concurrency import run_in_threadpool
 from sqlalchemy.orm import Session
-from sqlalchemy import or_, and_, desc, asc
+from sqlalchemy import or_, and_, desc, asc, text
 from sqlalchemy.exc import SQLAlchemyError, DBAPIError, OperationalError
 from typing import Optional, List
-from db.engine.engine import engine_init_local, engine_init_remote
-from db.session.session import create_session_factory
+from db.engine.registry import get_session_factory, reset_engine
 from db.models.Job import Job
+from db.models.Subscription import Subscription
+from db.repository import (
+    archive_repository,
+    change_repository,
+    stats_repository,
+    subscription_repository,
+)
+from config.changes import (
+    CHANGE_FEED_HEARTBEAT_SECONDS,
+    CHANGE_FEED_MAX_LIMIT,
+    CHANGE_FEED_MAX_WAIT_SECONDS,
+)
+from services.changes.feed import ChangeFeed
+from config.job_index import JOB_INDEX_ENABLED, JOB_INDEX_EXCLUDED_FIELDS
+from services.job_index.index import SEARCH_FIELDS, JobIndex
 from services.logger.logger_config import Logger
+from services.logger.context import request_id, reset_request_id, set_request_id
+from services.metrics.metrics import API_REQUEST_SECONDS, render_latest
+from services.percolator.matcher import parse_keywords
 import os
 from dotenv import load_dotenv
+import asyncio
+import json
 import re
+import time
 from sqlalchemy import func
 
-app = FastAPI()
+router = APIRouter()
 
 logger = Logger("main").get()
 load_dotenv()
 environment = os.getenv("API_ENV")
 RETRY_COUNTS = int(os.getenv("API_FETCH_RETRY_COUNTS", 3))
 JOB_FIELDS = [column.name for column in Job.__table__.columns]
-if environment == "prod":
-    logger.info("Running in production mode")
-    engine = engine_init_remote()
-else:
-    logger.info("Running in development mode")
-    engine = engine_init_local()
+DB_ENV = "prod" if environment == "prod" else "dev"
 
-SessionLocal = create_session_factory(engine)
+
+def new_session() -> Session:
+    # The engine is created on first use (normally the warm-up below), so
+    # importing this module never touches the database
+    return get_session_factory(DB_ENV)()
+
+
+change_feed = ChangeFeed(new_session)
+job_index = JobIndex(new_session) if JOB_INDEX_ENABLED else None
+
+
+def warm_up():
+    try:
+        with new_session() as db:
+            db.execute(text("SELECT 1"))
+        change_feed.latest_seq(fresh=True)
+        logger.info("Database connection warmed up")
+    except Exception as e:
+        logger.warning("Database warm-up failed, connecting on first request: %s", e)
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    if environment == "prod":
+        logger.info("Running in production mode")
+    else:
+        logger.info("Running in development mode")
+    await asyncio.to_thread(warm_up)
+
+    index_task = None
+    if job_index is not None:
+        # Requests are answered from SQL until the index has loaded
+        async def build_and_follow():
+            if await asyncio.to_thread(job_index.load, logger):
+                await job_index.follow(change_feed, logger)
+
+        index_task = asyncio.create_task(build_and_follow())
+
+    yield
+
+    if index_task is not None:
+        index_task.cancel()
 
 
 def get_db():
-    db = SessionLocal()
+    db = new_session()
     try:
         yield db
     finally:
@@ -45,38 +105,133 @@ def handle_db_connection_error(error, db: Session):
         or "hrana" in error_str
         or "connection" in error_str
     ):
-        logger.warning(f"Database connection error detected: {error}")
+        logger.warning("Database connection error detected: %s", error)
 
         try:
             db.close()
 
-            global SessionLocal, engine
             if environment == "prod":
                 logger.info("Reconnecting to remote database...")
-                engine = engine_init_remote()
             else:
                 logger.info("Reconnecting to local database...")
-                engine = engine_init_local()
 
-            SessionLocal = create_session_factory(engine)
-            new_db = SessionLocal()
+            reset_engine(DB_ENV)
+            new_db = new_session()
             logger.info("Database reconnection successful")
             return new_db
 
         except Exception as reconnect_error:
-            logger.error(f"Failed to reconnect to database: {reconnect_error}")
+            logger.error("Failed to reconnect to database: %s", reconnect_error)
             raise HTTPException(
                 status_code=503,
                 detail="Database service temporarily unavailable. Please try again in a moment.",
             )
 
-    logger.error(f"Database error: {error}")
+    logger.error("Database error: %s", error)
     raise HTTPException(
         status_code=500, detail="An error occurred while processing your request."
     )
 
 
-@app.get("/api/jobs")
+async def assign_request_id(request: Request, call_next):
+    token = set_request_id(request.headers.get("X-Request-ID"))
+    try:
+        response = await call_next(request)
+        response.headers["X-Request-ID"] = request_id.get()
+        return response
+    finally:
+        reset_request_id(token)
+
+
+async def record_request_metrics(request: Request, call_next):
+    started = time.perf_counter()
+    status = "500"
+    try:
+        response = await call_next(request)
+        status = str(response.status_code)
+        return response
+    finally:
+        route = request.scope.get("route")
+        API_REQUEST_SECONDS.labels(
+            request.method, route.path if route else "unmatched", status
+        ).observe(time.perf_counter() - started)
+
+
+def page_response(jobs, total_count, limit, offset, filters_applied) -> dict:
+    total_pages = (total_count + limit - 1) // limit
+    current_page = (offset // limit) + 1
+    has_next = offset + limit < total_count
+    has_prev = offset > 0
+
+    return {
+        "jobs": jobs,
+        "pagination": {
+            "total_count": total_count,
+            "total_pages": total_pages,
+            "current_page": current_page,
+            "limit": limit,
+            "offset": offset,
+            "has_next": has_next,
+            "has_prev": has_prev,
+        },
+        "filters_applied": filters_applied,
+    }
+
+
+def read_jobs_from_index(
+    db: Session, limit, offset, salary, posted_after, posted_before, sort_by, order, q, exclude
+):
+    exclude_fields = parse_exclude_fields(exclude)
+    if len(exclude_fields) == len(JOB_FIELDS):
+        raise HTTPException(
+            status_code=400,
+            detail="Excluding all fields is not allowed.",
+        )
+
+    records = job_index.query(salary, posted_after, posted_before, sort_by, order)
+    page = records[offset : offset + limit]
+    if q:
+        # Applied to the page only and skipping excluded fields, the same as
+        # the SQL path
+        keywords = [
+            keyword.strip().lower() for keyword in q.split(",") if keyword.strip()
+        ]
+        fields = [field for field in SEARCH_FIELDS if field not in exclude_fields]
+        page = [
+            record
+            for record in page
+            if job_index.matches_keywords(record, keywords, fields)
+        ]
+
+    jobs = []
+    for record in page:
+        job = record.to_dict()
+        for field in JOB_FIELDS:
+            if field in exclude_fields or field not in job:
+                job[field] = None
+        jobs.append(job)
+
+    # Fields kept out of memory are read by primary key for this page only
+    missing_fields = [
+        field
+        for field in JOB_INDEX_EXCLUDED_FIELDS
+        if field not in exclude_fields
+    ]
+    if missing_fields and jobs:
+        rows = (
+            db.query(Job.job_id, *[getattr(Job, field) for field in missing_fields])
+            .filter(Job.job_id.in_([job["job_id"] for job in jobs]))
+            .all()
+        )
+        values = {row[0]: row[1:] for row in rows}
+        for job in jobs:
+            for field, value in zip(missing_fields, values.get(job["job_id"], ())):
+                job[field] = value
+
+    return len(records), jobs
+
+
+@router.get("/api/jobs")
 def read_jobs(
     db: Session = Depends(get_db),
     limit: int = Query(
@@ -106,6 +261,10 @@ def read_jobs(
         default=None,
         description="Fields to exclude from the response (comma-separated)",
     ),
+    include_archived: bool = Query(
+        default=False,
+        description="Also return expired and closed postings moved to the archive",
+    ),
 ):
     """
     Get jobs with pagination, filtering, sorting, and search capabilities.
@@ -119,6 +278,7 @@ def read_jobs(
     - **sort_by**: Field to sort by (default: date_created)
     - **order**: Sort order - 'asc' or 'desc' (default: desc)
     - **q**: Search keywords in title and job_overview (comma-separated)
+    - **include_archived**: Also search archived postings (slower)
     """
     try:
         if page is not None:
@@ -150,36 +310,70 @@ def read_jobs(
         if q:
             q = re.sub(r"[^\w\s,.-]", "", q.strip())
 
+        # The index matches salary literally, LIKE wildcards go to SQL
+        if (
+            job_index is not None
+            and job_index.ready
+            and not include_archived
+            and not (salary and ("%" in salary or "_" in salary))
+        ):
+            if salary:
+                salary = salary.strip()
+            total_count, jobs = read_jobs_from_index(
+                db, limit, offset, salary, posted_after, posted_before,
+                sort_by, order, q, exclude,
+            )
+            return page_response(
+                jobs,
+                total_count,
+                limit,
+                offset,
+                {
+                    "salary": salary,
+                    "posted_after": posted_after,
+                    "posted_before": posted_before,
+                    "search_query": q,
+                    "sort_by": sort_by,
+                    "order": order,
+                },
+            )
+
         retry_count = 0
 
         while retry_count <= RETRY_COUNTS:
             try:
-                query = db.query(Job)
+                # Archived rows can share an id with a stored job, so they are
+                # read as columns rather than through the identity map
+                model = (
+                    archive_repository.jobs_with_archive() if include_archived else Job
+                )
+                query = db.query(model)
 
                 filters = []
 
                 if salary:
                     salary = salary.strip()
-                    filters.append(func.lower(Job.salary).like(f"%{salary.lower()}%"))
+                    filters.append(func.lower(model.salary).like(f"%{salary.lower()}%"))
 
                 if posted_after:
-                    filters.append(Job.date_created >= posted_after)
+                    filters.append(model.date_created >= posted_after)
 
                 if posted_before:
-                    filters.append(Job.date_created <= posted_before)
+                    filters.append(model.date_created <= posted_before)
 
                 if filters:
                     query = query.filter(and_(*filters))
 
                 if sort_by:
-                    sort_column = getattr(Job, sort_by)
+                    sort_column = getattr(model, sort_by)
                     if order == "desc":
                         query = query.order_by(desc(sort_column))
                     else:
                         query = query.order_by(asc(sort_column))
                 else:
-                    query = query.order_by(desc(Job.date_created))
+                    query = query.order_by(desc(model.date_created))
 
+                exclude_fields = []
                 if exclude:
                     exclude_fields = [
                         field.strip() for field in exclude.split(",") if field.strip()
@@ -198,16 +392,17 @@ def read_jobs(
                             detail="Excluding all fields is not allowed.",
                         )
 
+                if exclude_fields or include_archived:
                     query = query.with_entities(
                         *[
-                            getattr(Job, field)
+                            getattr(model, field)
                             for field in JOB_FIELDS
                             if field not in exclude_fields
                         ]
                     )
 
                 total_count = query.count()
-                if exclude:
+                if exclude_fields or include_archived:
                     jobs_tuple = query.offset(offset).limit(limit).all()
                     jobs = []
                     for job_data in jobs_tuple:
@@ -246,23 +441,12 @@ def read_jobs(
 
                     jobs = filtered_jobs
 
-                total_pages = (total_count + limit - 1) // limit
-                current_page = (offset // limit) + 1
-                has_next = offset + limit < total_count
-                has_prev = offset > 0
-
-                return {
-                    "jobs": jobs,
-                    "pagination": {
-                        "total_count": total_count,
-                        "total_pages": total_pages,
-                        "current_page": current_page,
-                        "limit": limit,
-                        "offset": offset,
-                        "has_next": has_next,
-                        "has_prev": has_prev,
-                    },
-                    "filters_applied": {
+                return page_response(
+                    jobs,
+                    total_count,
+                    limit,
+                    offset,
+                    {
                         "salary": salary,
                         "posted_after": posted_after,
                         "posted_before": posted_before,
@@ -270,7 +454,7 @@ def read_jobs(
                         "sort_by": sort_by,
                         "order": order,
                     },
-                }
+                )
 
             except (DBAPIError, OperationalError, SQLAlchemyError) as db_error:
                 error_str = str(db_error).lower()
@@ -281,7 +465,10 @@ def read_jobs(
                 ) and retry_count < RETRY_COUNTS:
 
                     logger.warning(
-                        f"Database connection error on attempt {retry_count + 1}/{RETRY_COUNTS + 1}: {db_error}"
+                        "Database connection error on attempt %s/%s: %s",
+                        retry_count + 1,
+                        RETRY_COUNTS + 1,
+                        db_error,
                     )
                     retry_count += 1
 
@@ -292,16 +479,338 @@ def read_jobs(
     except HTTPException:
         raise
     except (DBAPIError, OperationalError, SQLAlchemyError) as db_error:
-        logger.error(f"Database error retrieving jobs: {str(db_error)}")
+        logger.error("Database error retrieving jobs: %s", db_error)
         raise HTTPException(
             status_code=503,
             detail="Database service temporarily unavailable. Please try again.",
         )
     except Exception as e:
-        logger.error(f"Error retrieving jobs: {str(e)}")
+        logger.error("Error retrieving jobs: %s", e)
         raise HTTPException(status_code=500, detail="Internal server error")
 
 
-@app.get("/health")
+@router.get("/api/jobs/stats")
+def read_job_stats(
+    db: Session = Depends(get_db),
+    group_by: str = Query(
+        default="day",
+        description="Dimensions to count by (comma-separated): day, work_type, salary_band, hours_band",
+    ),
+    interval: str = Query(
+        default="day",
+        pattern="^(day|week|month)$",
+        description="Period length when grouping by day: day, week or month",
+    ),
+    posted_after: Optional[str] = Query(
+        default=None, description="Count jobs posted on or after this date (YYYY-MM-DD)"
+    ),
+    posted_before: Optional[str] = Query(
+        default=None, description="Count jobs posted on or before this date (YYYY-MM-DD)"
+    ),
+):
+    """
+    Get job counts from the precomputed daily rollup, for dashboards and
+    trend lines. The cost depends on the number of buckets, not on the
+    number of jobs.
+
+    - **group_by**: Any of day, work_type, salary_band, hours_band (comma-separated, default: day)
+    - **interval**: day, week or month buckets when grouping by day (default: day)
+    - **posted_after** / **posted_before**: Date range (YYYY-MM-DD format)
+    """
+    dimensions = [field.strip() for field in group_by.split(",") if field.strip()]
+    valid_dimensions = ["day", *stats_repository.DIMENSIONS]
+    invalid_dimensions = [field for field in dimensions if field not in valid_dimensions]
+    if invalid_dimensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid group_by field. Must be any of: {', '.join(valid_dimensions)}",
+        )
+
+    date_pattern = r"^\d{4}-\d{2}-\d{2}$"
+    if posted_after and not re.match(date_pattern, posted_after):
+        raise HTTPException(
+            status_code=400, detail="posted_after must be in YYYY-MM-DD format"
+        )
+    if posted_before and not re.match(date_pattern, posted_before):
+        raise HTTPException(
+            status_code=400, detail="posted_before must be in YYYY-MM-DD format"
+        )
+
+    try:
+        buckets = stats_repository.get_stats(
+            db, dimensions, interval, posted_after, posted_before
+        )
+    except (DBAPIError, OperationalError, SQLAlchemyError) as db_error:
+        logger.error("Database error retrieving job stats: %s", db_error)
+        raise HTTPException(
+            status_code=503,
+            detail="Database service temporarily unavailable. Please try again.",
+        )
+
+    return {
+        "buckets": buckets,
+        "total": sum(bucket["count"] for bucket in buckets),
+        "group_by": dimensions,
+        "interval": interval,
+    }
+
+
+def parse_exclude_fields(exclude: Optional[str]) -> List[str]:
+    if not exclude:
+        return []
+    exclude_fields = [field.strip() for field in exclude.split(",") if field.strip()]
+    invalid_fields = [field for field in exclude_fields if field not in JOB_FIELDS]
+    if invalid_fields:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid fields in exclude parameter: {', '.join(invalid_fields)}",
+        )
+    return exclude_fields
+
+
+def load_changes(since: int, limit: int, exclude_fields: List[str]) -> List[dict]:
+    fields = [field for field in JOB_FIELDS if field not in exclude_fields]
+    try:
+        with new_session() as db:
+            rows = change_repository.get_changes(db, since, limit)
+    except (DBAPIError, OperationalError, SQLAlchemyError) as db_error:
+        logger.error("Database error retrieving job changes: %s", db_error)
+        raise HTTPException(
+            status_code=503,
+            detail="Database service temporarily unavailable. Please try again.",
+        )
+
+    return [
+        {
+            "seq": change.seq,
+            "job_id": change.job_id,
+            "op": change.op,
+            "changed_at": change.changed_at,
+            # Current state of the job, None once it has been deleted
+            "job": (
+                {field: getattr(job, field) for field in fields}
+                if job is not None
+                else None
+            ),
+        }
+        for change, job in rows
+    ]
+
+
+@router.get("/api/jobs/changes")
+async def read_job_changes(
+    since: Optional[int] = Query(
+        default=None,
+        ge=0,
+        description="Sequence number of the last change seen (omit to get the current one)",
+    ),
+    limit: int = Query(
+        default=100,
+        ge=1,
+        le=CHANGE_FEED_MAX_LIMIT,
+        description=f"Maximum number of changes to return (1-{CHANGE_FEED_MAX_LIMIT})",
+    ),
+    wait: int = Query(
+        default=0,
+        ge=0,
+        le=CHANGE_FEED_MAX_WAIT_SECONDS,
+        description="Seconds to wait for new changes before returning an empty list",
+    ),
+    exclude: Optional[str] = Query(
+        default=None,
+        description="Job fields to exclude from the response (comma-separated)",
+    ),
+):
+    """
+    Get the jobs inserted, updated or deleted after a sequence number.
+
+    - **since**: `next` from the previous response; omit it to start from now
+    - **limit**: Maximum number of changes to return (default: 100)
+    - **wait**: Long-poll for up to this many seconds when nothing is new
+    - **exclude**: Job fields to leave out (comma-separated)
+    """
+    exclude_fields = parse_exclude_fields(exclude)
+    if since is None:
+        head = await run_in_threadpool(change_feed.latest_seq, True)
+        return {"changes": [], "next": head, "has_more": False}
+
+    head = await change_feed.wait_for(since, wait)
+    if head <= since:
+        return {"changes": [], "next": since, "has_more": False}
+
+    changes = await run_in_threadpool(load_changes, since, limit, exclude_fields)
+    next_seq = changes[-1]["seq"] if changes else since
+    return {
+        "changes": changes,
+        "next": next_seq,
+        "has_more": len(changes) == limit,
+    }
+
+
+@router.get("/api/jobs/changes/stream")
+async def stream_job_changes(
+    request: Request,
+    since: Optional[int] = Query(
+        default=None,
+        ge=0,
+        description="Sequence number of the last change seen (omit to start from now)",
+    ),
+    exclude: Optional[str] = Query(
+        default=None,
+        description="Job fields to exclude from the events (comma-separated)",
+    ),
+):
+    """
+    Stream job changes as Server-Sent Events. Each event carries the change
+    sequence number as its id, so reconnecting clients resume from
+    `Last-Event-ID`.
+    """
+    exclude_fields = parse_exclude_fields(exclude)
+    last_event_id = request.headers.get("Last-Event-ID")
+    if last_event_id and last_event_id.isdigit():
+        since = int(last_event_id)
+    if since is None:
+        since = await run_in_threadpool(change_feed.latest_seq, True)
+
+    async def events():
+        cursor = since
+        yield "retry: 5000\n\n"
+        # StreamingResponse cancels the generator when the client goes away
+        while True:
+            head = await change_feed.wait_for(cursor, CHANGE_FEED_HEARTBEAT_SECONDS)
+            if head <= cursor:
+                yield ": keep-alive\n\n"
+                continue
+            changes = await run_in_threadpool(
+                load_changes, cursor, CHANGE_FEED_MAX_LIMIT, exclude_fields
+            )
+            for change in changes:
+                yield (
+                    f"id: {change['seq']}\n"
+                    f"event: {change['op']}\n"
+                    f"data: {json.dumps(change, ensure_ascii=False)}\n\n"
+                )
+            if changes:
+                cursor = changes[-1]["seq"]
+            else:
+                cursor = head
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+class SubscriptionRequest(BaseModel):
+    name: str = Field(min_length=1)
+    keywords: Optional[str] = Field(
+        default=None,
+        description="Comma-separated keywords that must all appear as whole words",
+    )
+    work_type: Optional[str] = None
+    min_salary: Optional[float] = Field(default=None, ge=0, description="Monthly USD")
+    max_salary: Optional[float] = Field(default=None, ge=0, description="Monthly USD")
+
+
+def subscription_response(subscription: Subscription) -> dict:
+    return {
+        "id": subscription.id,
+        "name": subscription.name,
+        "keywords": subscription.keywords,
+        "work_type": subscription.work_type,
+        "min_salary": subscription.min_salary,
+        "max_salary": subscription.max_salary,
+        "active": subscription.active,
+        "created_at": subscription.created_at,
+    }
+
+
+@router.post("/api/subscriptions", status_code=201)
+def create_subscription(request: SubscriptionRequest, db: Session = Depends(get_db)):
+    """
+    Save a search. New jobs that match it are sent to the webhook as
+    subscription.matched events when they are stored.
+    """
+    keywords = parse_keywords(request.keywords)
+    if not keywords and request.min_salary is None and not request.work_type:
+        raise HTTPException(
+            status_code=400,
+            detail="A subscription needs keywords, a work_type or a min_salary",
+        )
+    if (
+        request.min_salary is not None
+        and request.max_salary is not None
+        and request.min_salary > request.max_salary
+    ):
+        raise HTTPException(
+            status_code=400, detail="min_salary must not be greater than max_salary"
+        )
+
+    subscription = Subscription(
+        name=request.name,
+        keywords=", ".join(keywords) or None,
+        work_type=request.work_type,
+        min_salary=request.min_salary,
+        max_salary=request.max_salary,
+        active=True,
+    )
+    try:
+        subscription_repository.add_subscription(db, subscription)
+        db.commit()
+    except (DBAPIError, OperationalError, SQLAlchemyError) as db_error:
+        db.rollback()
+        logger.error("Database error saving subscription: %s", db_error)
+        raise HTTPException(
+            status_code=503,
+            detail="Database service temporarily unavailable. Please try again.",
+        )
+    return subscription_response(subscription)
+
+
+@router.get("/api/subscriptions")
+def read_subscriptions(db: Session = Depends(get_db)):
+    return {
+        "subscriptions": [
+            subscription_response(subscription)
+            for subscription in subscription_repository.get_subscriptions(db)
+        ]
+    }
+
+
+@router.get("/api/subscriptions/{subscription_id}")
+def read_subscription(subscription_id: int, db: Session = Depends(get_db)):
+    subscription = subscription_repository.get_subscription(db, subscription_id)
+    if subscription is None:
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    return subscription_response(subscription)
+
+
+@router.delete("/api/subscriptions/{subscription_id}", status_code=204)
+def delete_subscription(subscription_id: int, db: Session = Depends(get_db)):
+    if not subscription_repository.delete_subscription(db, subscription_id):
+        raise HTTPException(status_code=404, detail="Subscription not found")
+    db.commit()
+    return Response(status_code=204)
+
+
+@router.get("/health")
 def health_check():
     return {"status": "ok"}
+
+
+@router.get("/metrics")
+def metrics():
+    body, content_type = render_latest()
+    return Response(content=body, media_type=content_type)
+
+
+def create_app() -> FastAPI:
+    app = FastAPI(lifespan=lifespan)
+    app.middleware("http")(assign_request_id)
+    app.middleware("http")(record_request_metrics)
+    app.include_router(router)
+    return app
+
+
+app = create_app()
@@ -0,0 +1,73 @@
+import importlib
+import os
+import statistics
+import tempfile
+import time
+from pathlib import Path
+from db.engine.engine import engine_init_local
+from db.engine.registry import dispose_engines
+from db.models.Base import Base
+from benchmarks.seed import seed_jobs
+
+QUERIES = {
+    "default": "/api/jobs",
+    "limit_100": "/api/jobs?limit=100",
+    "deep_page": "/api/jobs?page=500&limit=20",
+    "search": "/api/jobs?q=python,react&limit=50",
+    "salary": "/api/jobs?salary=php",
+    "date_range": "/api/jobs?posted_after=2025-06-01&posted_before=2025-07-01",
+    "sort_id_asc": "/api/jobs?sort_by=id&order=asc",
+    "exclude_raw": "/api/jobs?exclude=raw_text,job_overview&limit=100",
+}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run(rows=100_000, requests_per_query=50) -> dict:
+    from fastapi.testclient import TestClient
+
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        url = f"sqlite:///{Path(tmp) / 'api.db'}"
+        engine = engine_init_local(url)
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        seed_jobs(engine, rows)
+        results["seed_rows_per_sec"] = rows / (time.perf_counter() - start)
+        engine.dispose()
+
+        previous_env = {key: os.environ.get(key) for key in ("API_ENV", "LOCAL_DATABASE_URL")}
+        os.environ["API_ENV"] = "dev"
+        os.environ["LOCAL_DATABASE_URL"] = url
+        try:
+            import api
+
+            dispose_engines()
+            api = importlib.reload(api)
+            client = TestClient(api.app)
+            for name, path in QUERIES.items():
+                client.get(path)
+                samples = []
+                for _ in range(requests_per_query):
+                    start = time.perf_counter()
+                    response = client.get(path)
+                    samples.append((time.perf_counter() - start) * 1000)
+                    response.raise_for_status()
+                results[name] = {
+                    "p50_ms": statistics.median(samples),
+                    "p99_ms": percentile(samples, 99),
+                    "mean_ms": statistics.fmean(samples),
+                }
+            dispose_engines()
+        finally:
+            for key, value in previous_env.items():
+                if value is None:
+                    os.environ.pop(key, None)
+                else:
+                    os.environ[key] = value
+
+    return results
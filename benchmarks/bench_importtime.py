@@ -0,0 +1,75 @@
+import os
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+ENTRY_POINTS = ["main", "api"]
+TOP_IMPORTS = 5
+
+
+def parse_importtime(stderr, module) -> dict:
+    """Cumulative microseconds of ``module`` and of each of its direct imports."""
+    children = {}
+    total = None
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|", 2)
+        if not cumulative.strip().isdigit():
+            continue
+        depth = (len(name) - len(name.lstrip(" "))) // 2
+        if depth == 0:
+            if name.strip() == module:
+                total = int(cumulative)
+                break
+            # Lines are printed when an import finishes, so the children of
+            # the module are the depth 1 lines right before it; earlier ones
+            # belong to imports the interpreter made at startup
+            children = {}
+        elif depth == 1:
+            children[name.strip()] = int(cumulative)
+    return {"total": total, "children": children}
+
+
+def measure(module):
+    env = dict(os.environ, PYTHONPATH=str(ROOT), PYTHONDONTWRITEBYTECODE="1")
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+    )
+    wall = time.perf_counter() - started
+    if result.returncode != 0:
+        raise RuntimeError(f"import {module} failed:\n{result.stderr[-2000:]}")
+    return wall, parse_importtime(result.stderr, module)
+
+
+def run(iterations=5) -> dict:
+    results = {}
+    for module in ENTRY_POINTS:
+        # Warm run so every measured one reads from compiled bytecode
+        measure(module)
+        walls, totals, children = [], [], {}
+        for _ in range(iterations):
+            wall, parsed = measure(module)
+            walls.append(wall)
+            totals.append(parsed["total"])
+            for name, cumulative in parsed["children"].items():
+                children.setdefault(name, []).append(cumulative)
+
+        heaviest = sorted(
+            ((statistics.median(values), name) for name, values in children.items()),
+            reverse=True,
+        )[:TOP_IMPORTS]
+        results[module] = {
+            "import_ms": statistics.median(totals) / 1000,
+            "process_ms": statistics.median(walls) * 1000,
+            "heaviest_imports_ms": {name: value / 1000 for value, name in heaviest},
+        }
+    return results
@@ -0,0 +1,34 @@
+import tempfile
+import time
+from pathlib import Path
+from db.engine.engine import engine_init_local
+from db.models.Base import Base
+from db.models.Job import Job
+from db.repository import job_repository
+from db.session.session import create_session_factory
+from benchmarks.seed import make_rows, seed_jobs
+
+
+def run(rows=5000) -> dict:
+    results = {}
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = engine_init_local(f"sqlite:///{Path(tmp) / 'orm.db'}")
+        Base.metadata.create_all(bind=engine)
+        SessionLocal = create_session_factory(engine)
+        jobs = [Job(**row) for row in make_rows(rows)]
+
+        start = time.perf_counter()
+        with SessionLocal() as session:
+            job_repository.add_jobs_bulk(session, jobs)
+            session.commit()
+        results["orm_rows_per_sec"] = rows / (time.perf_counter() - start)
+        engine.dispose()
+
+        engine = engine_init_local(f"sqlite:///{Path(tmp) / 'core.db'}")
+        Base.metadata.create_all(bind=engine)
+        start = time.perf_counter()
+        seed_jobs(engine, rows)
+        results["core_rows_per_sec"] = rows / (time.perf_counter() - start)
+        engine.dispose()
+
+    return results
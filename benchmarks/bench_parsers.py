@@ -0,0 +1,29 @@
+import time
+import config.urls
+from benchmarks.mock_site import DETAIL_FIXTURES
+from scraper.http_cache import CachedResponse
+from scraper.job_detail_scraper import parse_job_detail
+
+
+def run(iterations=200) -> dict:
+    # The production parser, fed the same response type the HTTP cache returns
+    pages = [
+        CachedResponse(200, path.read_bytes(), encoding="utf-8")
+        for path in DETAIL_FIXTURES
+    ]
+    results = {}
+    total_pages = 0
+    total_seconds = 0.0
+
+    for index, (path, response) in enumerate(zip(DETAIL_FIXTURES, pages)):
+        url = config.urls.BASE_JOB_DETAIL_URL + str(index)
+        start = time.perf_counter()
+        for _ in range(iterations):
+            parse_job_detail(index, url, response)
+        elapsed = time.perf_counter() - start
+        results[f"{path.stem}_pages_per_sec"] = iterations / elapsed
+        total_pages += iterations
+        total_seconds += elapsed
+
+    results["pages_per_sec"] = total_pages / total_seconds
+    return results
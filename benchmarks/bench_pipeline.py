@@ -0,0 +1,98 @@
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest import mock
+import config.urls
+from db.engine.engine import engine_init_local
+from db.models.Base import Base
+from db.models.Job import Job
+from db.session.session import create_session_factory
+from benchmarks.mock_site import MockSite
+
+# Need to import all models here because otherwise they won't be registered in Base
+from db.models.JobSignature import JobSignature
+from db.models.LshBucket import LshBucket
+
+
+def _mock_gemini_client(base_url):
+    from google import genai
+    from google.genai import types
+
+    return genai.Client(
+        api_key="mock", http_options=types.HttpOptions(base_url=base_url)
+    )
+
+
+def run(latency=0.05, llm_latency=0.2, rate_limit_every=25) -> dict:
+    try:
+        import google.genai  # noqa: F401
+    except ImportError:
+        return {"skipped": "google-genai is not installed"}
+
+    import main
+    import services.ingest.pipeline as pipeline
+    import services.egress.egress as egress
+
+    site = MockSite(
+        latency=latency, llm_latency=llm_latency, rate_limit_every=rate_limit_every
+    ).start()
+    results = {}
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            url = f"sqlite:///{Path(tmp) / 'pipeline.db'}"
+            engine = engine_init_local(url)
+            Base.metadata.create_all(bind=engine)
+
+            patches = [
+                mock.patch.object(config.urls, "BASE_URL", site.url),
+                mock.patch.object(
+                    config.urls, "BASE_JOB_DETAIL_URL", site.url + "/jobseekers/job/"
+                ),
+                mock.patch.object(
+                    config.urls,
+                    "BASE_JOB_SEARCH_URL",
+                    site.url + "/jobseekers/jobsearch?jobkeyword=",
+                ),
+                mock.patch.object(
+                    pipeline,
+                    "init_gemini_client",
+                    lambda: _mock_gemini_client(site.url),
+                ),
+                # Politeness delays would dominate the measurement, start the
+                # adaptive rate control high and let the mock's 429s pull it down
+                mock.patch.object(egress, "_manager", None),
+                mock.patch.object(egress, "EGRESS_INITIAL_RATE", 50.0),
+                mock.patch.object(egress, "EGRESS_MAX_RATE", 200.0),
+                mock.patch.object(sys, "argv", ["main.py", "--dev", "--no-cache"]),
+                mock.patch.dict(
+                    os.environ,
+                    {
+                        "LOCAL_DATABASE_URL": url,
+                        "WEBHOOK_URL": site.url + "/webhook/trigger",
+                    },
+                ),
+            ]
+            for patch in patches:
+                patch.start()
+            try:
+                start = time.perf_counter()
+                main.main()
+                elapsed = time.perf_counter() - start
+            finally:
+                for patch in reversed(patches):
+                    patch.stop()
+
+            with create_session_factory(engine)() as session:
+                inserted = session.query(Job).count()
+            engine.dispose()
+
+        results["seconds"] = elapsed
+        results["jobs_inserted"] = inserted
+        results["jobs_per_sec"] = inserted / elapsed if elapsed else 0.0
+        results["site"] = dict(site.stats)
+    finally:
+        site.stop()
+
+    return results
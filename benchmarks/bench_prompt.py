@@ -0,0 +1,127 @@
+from bs4 import BeautifulSoup
+import parser.parsers as parsers
+from benchmarks.mock_site import DETAIL_FIXTURES
+from db.models.Job import Job
+from config.prompt import SUMMARY_SYSTEM_INSTRUCTION
+from services.prompt.compaction import (
+    PRIMARY_SECTION,
+    clean_lines,
+    compact_job_info,
+    estimate_tokens,
+    is_header,
+)
+
+# The prompt sent before compaction: instructions inlined in every request
+# followed by Job.str_no_summary()
+LEGACY_TEMPLATE = """
+    You are a job summarization assistant.
+
+    I will give you detailed information about a job posting. Your task is to generate a compact, Telegram-ready job notification message. The message should be:
+
+    1. Scannable on mobile.
+    2. Concise (no more than ~150 words).
+    3. Include the following sections:
+    - Job Title & Focus
+    - Type & Hours
+    - Salary
+    - Company / Industry (optional)
+    - Key Responsibilities (2-3 bullets max)
+    - Key Requirements (2-3 bullets max)
+    - Bonus Skills (if relevant)
+    - Link / CTA (if provided)
+
+    Use short, clear bullet points where appropriate. Keep formatting readable and professional. Do not include unnecessary details.
+    IMPORTANT:
+    - Do NOT include any preamble, introduction, or phrases like "Here is a compact Telegram-ready job summary" or "Summary:". 
+    - Output ONLY the final Telegram message in the requested format.
+    - Start directly with the job title.
+    - Format it using plain text, no markdown.
+    - Output ONLY the final Telegram message in the requested format.
+
+    Here is the job information:
+
+    {job_info}
+    """
+
+FILLER = (
+    "Our company was founded in 2012 and has grown from a two-person team into "
+    "a distributed group of more than forty people across six countries. We "
+    "believe in transparency, ownership and work-life balance, and we celebrate "
+    "every win together during our monthly all-hands calls."
+)
+
+
+def load_job(path) -> Job:
+    soup = BeautifulSoup(path.read_bytes(), "html.parser")
+    return Job(
+        job_id=path.stem,
+        title=parsers.get_title(soup),
+        work_type=parsers.get_work_type(soup),
+        salary=parsers.get_salary(soup),
+        hours_per_week=parsers.get_hours_per_week(soup),
+        job_overview=parsers.get_job_overview(soup),
+        link=f"https://www.onlinejobs.ph/jobseekers/job/{path.stem}",
+    )
+
+
+def long_ad(job: Job) -> Job:
+    # A rambling ad of the kind that blows up prompt sizes: company history,
+    # the same section pasted twice and a sign-off
+    overview = "\n\n".join(
+        ["Hi there!", "About us:", *[FILLER] * 6, job.job_overview, job.job_overview,
+         "We look forward to hearing from you!"]
+    )
+    return Job(
+        job_id=f"{job.job_id}_long",
+        title=job.title,
+        work_type=job.work_type,
+        salary=job.salary,
+        hours_per_week=job.hours_per_week,
+        job_overview=overview,
+        link=job.link,
+    )
+
+
+def key_lines(job: Job) -> list:
+    """Lines of the responsibilities/requirements sections."""
+    lines = []
+    in_primary = False
+    for line in clean_lines(job.job_overview):
+        if is_header(line):
+            in_primary = bool(PRIMARY_SECTION.search(line))
+        elif in_primary:
+            lines.append(line)
+    return lines
+
+
+def run() -> dict:
+    jobs = [load_job(path) for path in DETAIL_FIXTURES]
+    jobs.append(long_ad(jobs[0]))
+
+    results = {}
+    total_before = 0
+    total_after = 0
+    for job in jobs:
+        before = estimate_tokens(
+            LEGACY_TEMPLATE.format(job_info=job.str_no_summary())
+            + f"\nApply here: {job.link}"
+        )
+        job_info = compact_job_info(job)
+        user_tokens = estimate_tokens(f"{job_info}\nApply here: {job.link}")
+        after = estimate_tokens(SUMMARY_SYSTEM_INSTRUCTION) + user_tokens
+
+        required = key_lines(job)
+        retained = sum(1 for line in required if line in job_info)
+        results[job.job_id] = {
+            "prompt_tokens_before": before,
+            "prompt_tokens_after": after,
+            "job_tokens_after": user_tokens,
+            "key_lines_retained": retained / len(required) if required else 1.0,
+        }
+        total_before += before
+        total_after += after
+
+    results["prompt_tokens_per_job_before"] = total_before / len(jobs)
+    results["prompt_tokens_per_job_after"] = total_after / len(jobs)
+    results["reduction_pct"] = (1 - total_after / total_before) * 100
+    return results
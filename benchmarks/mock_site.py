@@ -0,0 +1,205 @@
+import argparse
+import hashlib
+import json
+import random
+import re
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+FIXTURES_DIR = Path(__file__).parent / "fixtures"
+DETAIL_FIXTURES = sorted(FIXTURES_DIR.glob("detail_*.html"))
+DESCRIPTION_TAG = b'<p id="job-description" class="job-description">'
+
+FAKE_SUMMARY = (
+    "Senior Python Developer - remote\n"
+    "Type: Full Time, 40 hrs/week\n"
+    "Salary: $1,500 - $2,200/month\n"
+    "- Build REST APIs\n"
+    "- Review pull requests"
+)
+
+
+class MockSite:
+    """
+    Local stand-in for onlinejobs.ph plus a fake LLM endpoint.
+
+    Serves the recorded listing/detail fixtures with a configurable latency,
+    each detail page with an overview of its own so near-duplicate linking
+    does not short-circuit the pipeline,
+    answers every ``rate_limit_every``-th page request with a 429, and
+    implements just enough of the Gemini ``generateContent`` and OpenAI
+    ``chat/completions`` APIs to return a canned summary.
+    """
+
+    def __init__(self, port=0, latency=0.0, llm_latency=0.0, rate_limit_every=0):
+        self.latency = latency
+        self.llm_latency = llm_latency
+        self.rate_limit_every = rate_limit_every
+        self.listing = (FIXTURES_DIR / "listing.html").read_bytes()
+        self.details = [path.read_bytes() for path in DETAIL_FIXTURES]
+        self.page_requests = 0
+        self.stats = {"pages": 0, "rate_limited": 0, "llm": 0, "webhook": 0}
+        self._lock = threading.Lock()
+        self.server = ThreadingHTTPServer(("127.0.0.1", port), self._handler())
+        self.server.daemon_threads = True
+
+    def detail_page(self, job_id) -> bytes:
+        # A paragraph drawn from the fixture's own words, seeded by the job
+        # id and as long as the original overview, keeps every page well
+        # below the near-duplicate threshold and the same on every request
+        body = self.details[job_id % len(self.details)]
+        start = body.index(DESCRIPTION_TAG) + len(DESCRIPTION_TAG)
+        overview = body[start : body.index(b"</p>", start)].decode("utf-8")
+        words = re.findall(r"[A-Za-z]+", re.sub(r"<[^>]+>", " ", overview))
+        rng = random.Random(job_id)
+        paragraph = " ".join(rng.choice(words) for _ in words).capitalize() + "."
+        return body[:start] + paragraph.encode("utf-8") + b"<br>\n" + body[start:]
+
+    @property
+    def url(self):
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def _count_page(self):
+        with self._lock:
+            self.page_requests += 1
+            limited = (
+                self.rate_limit_every > 0
+                and self.page_requests % self.rate_limit_every == 0
+            )
+            self.stats["rate_limited" if limited else "pages"] += 1
+            return limited
+
+    def _handler(self):
+        site = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def log_message(self, format, *args):
+                pass
+
+            def _send(self, status, body=b"", content_type="text/html", headers=None):
+                self.send_response(status)
+                self.send_header("Content-Type", content_type)
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def _send_page(self, body):
+                if site.latency:
+                    time.sleep(site.latency)
+                if site._count_page():
+                    self._send(429, b"Too Many Requests", headers={"Retry-After": "1"})
+                    return
+                etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+                if self.headers.get("If-None-Match") == etag:
+                    self._send(304, headers={"ETag": etag})
+                    return
+                self._send(200, body, "text/html; charset=utf-8", {"ETag": etag})
+
+            def do_GET(self):
+                path = self.path.split("?", 1)[0]
+                if path.startswith("/jobseekers/jobsearch"):
+                    self._send_page(site.listing)
+                    return
+                match = re.match(r"^/jobseekers/job/(\d+)$", path)
+                if match:
+                    job_id = int(match.group(1))
+                    self._send_page(site.detail_page(job_id))
+                    return
+                self._send(404, b"Not Found")
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                payload = self.rfile.read(length) if length else b""
+                path = self.path.split("?", 1)[0]
+
+                if ":generateContent" in path or path.endswith("/chat/completions"):
+                    with site._lock:
+                        site.stats["llm"] += 1
+                    if site.llm_latency:
+                        time.sleep(site.llm_latency)
+                    prompt_tokens = max(1, len(payload) // 4)
+                    if path.endswith("/chat/completions"):
+                        body = {
+                            "id": "mock",
+                            "object": "chat.completion",
+                            "created": int(time.time()),
+                            "model": "mock",
+                            "choices": [
+                                {
+                                    "index": 0,
+                                    "message": {"role": "assistant", "content": FAKE_SUMMARY},
+                                    "finish_reason": "stop",
+                                }
+                            ],
+                            "usage": {
+                                "prompt_tokens": prompt_tokens,
+                                "completion_tokens": 40,
+                                "total_tokens": prompt_tokens + 40,
+                            },
+                        }
+                    else:
+                        body = {
+                            "candidates": [
+                                {
+                                    "content": {"role": "model", "parts": [{"text": FAKE_SUMMARY}]},
+                                    "finishReason": "STOP",
+                                }
+                            ],
+                            "usageMetadata": {
+                                "promptTokenCount": prompt_tokens,
+                                "candidatesTokenCount": 40,
+                                "totalTokenCount": prompt_tokens + 40,
+                            },
+                        }
+                    self._send(200, json.dumps(body).encode(), "application/json")
+                    return
+
+                if path.startswith("/webhook"):
+                    with site._lock:
+                        site.stats["webhook"] += 1
+                    self._send(200, b"{}", "application/json")
+                    return
+
+                self._send(404, b"Not Found")
+
+        return Handler
+
+    def start(self):
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        return self
+
+    def stop(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Mock onlinejobs.ph site for benchmarks")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--latency", type=float, default=0.05, help="Seconds per page")
+    parser.add_argument("--llm-latency", type=float, default=0.2, help="Seconds per LLM call")
+    parser.add_argument(
+        "--rate-limit-every", type=int, default=0, help="Answer every Nth page with 429"
+    )
+    args = parser.parse_args()
+
+    site = MockSite(args.port, args.latency, args.llm_latency, args.rate_limit_every)
+    print(f"Mock site listening on {site.url}")
+    try:
+        site.server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        site.server.server_close()
+
+
+if __name__ == "__main__":
+    main()
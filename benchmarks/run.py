@@ -0,0 +1,109 @@
+import argparse
+import json
+import platform
+import subprocess
+import time
+from datetime import datetime
+from pathlib import Path
+from benchmarks import (
+    bench_api,
+    bench_importtime,
+    bench_insert,
+    bench_parsers,
+    bench_pipeline,
+    bench_prompt,
+)
+
+RESULTS_DIR = Path(__file__).parent / "results"
+
+BENCHMARKS = {
+    "parsers": lambda args: bench_parsers.run(iterations=args.parse_iterations),
+    "insert": lambda args: bench_insert.run(rows=args.insert_rows),
+    "api": lambda args: bench_api.run(rows=args.api_rows),
+    "pipeline": lambda args: bench_pipeline.run(),
+    "prompt": lambda args: bench_prompt.run(),
+    "importtime": lambda args: bench_importtime.run(iterations=args.import_iterations),
+}
+
+
+def git_revision():
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], text=True, stderr=subprocess.DEVNULL
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def compare(current, baseline_path):
+    baseline = json.loads(Path(baseline_path).read_text())
+    before = flatten(baseline["results"])
+    after = flatten(current["results"])
+    print(f"\nCompared with {baseline_path} ({baseline['meta'].get('revision')}):")
+    for name in sorted(after):
+        if name not in before or not before[name]:
+            continue
+        change = (after[name] - before[name]) / before[name] * 100
+        print(f"  {name:50s} {before[name]:12.2f} -> {after[name]:12.2f} ({change:+.1f}%)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="OLJ Scraper benchmark suite")
+    parser.add_argument(
+        "--only",
+        default=",".join(BENCHMARKS),
+        help=f"Comma-separated benchmarks to run ({', '.join(BENCHMARKS)})",
+    )
+    parser.add_argument("--parse-iterations", type=int, default=200)
+    parser.add_argument("--insert-rows", type=int, default=5000)
+    parser.add_argument("--api-rows", type=int, default=100_000)
+    parser.add_argument("--import-iterations", type=int, default=5)
+    parser.add_argument("--output", help="Where to write the JSON results")
+    parser.add_argument("--compare", help="Previous results file to compare against")
+    args = parser.parse_args()
+
+    selected = [name.strip() for name in args.only.split(",") if name.strip()]
+    unknown = [name for name in selected if name not in BENCHMARKS]
+    if unknown:
+        parser.error(f"Unknown benchmarks: {', '.join(unknown)}")
+
+    report = {
+        "meta": {
+            "revision": git_revision(),
+            "timestamp": datetime.now().isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+        },
+        "results": {},
+    }
+    for name in selected:
+        print(f"Running {name} benchmark...")
+        start = time.perf_counter()
+        report["results"][name] = BENCHMARKS[name](args)
+        print(f"  done in {time.perf_counter() - start:.1f}s")
+
+    RESULTS_DIR.mkdir(exist_ok=True)
+    output = Path(args.output) if args.output else RESULTS_DIR / (
+        f"{datetime.now():%Y%m%d-%H%M%S}-{report['meta']['revision'] or 'local'}.json"
+    )
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["results"], indent=2))
+    print(f"Results written to {output}")
+
+    if args.compare:
+        compare(report, args.compare)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,38 @@
+import random
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from db.models.Job import Job
+
+WORK_TYPES = ["Full Time", "Part Time", "Gig", None]
+SALARIES = ["$400 - $600/month", "$1,500", "PHP 25,000", "$5/hour", "TBD", None]
+WORDS = (
+    "python django react virtual assistant data entry marketing seo shopify "
+    "wordpress design video editing customer support bookkeeping sales lead "
+    "generation email writing research excel amazon social media manager"
+).split()
+
+
+def make_rows(count, start_id=0, raw_text_size=512, seed=42):
+    rng = random.Random(seed + start_id)
+    now = datetime(2025, 9, 1)
+    for i in range(start_id, start_id + count):
+        overview = " ".join(rng.choice(WORDS) for _ in range(80))
+        yield {
+            "job_id": str(1_000_000 + i),
+            "title": " ".join(rng.choice(WORDS) for _ in range(4)).title(),
+            "work_type": rng.choice(WORK_TYPES),
+            "salary": rng.choice(SALARIES),
+            "hours_per_week": rng.choice(["20", "40", "TBD"]),
+            "job_overview": overview,
+            "summary": overview[:200],
+            "link": f"https://www.onlinejobs.ph/jobseekers/job/{1_000_000 + i}",
+            "raw_text": "x" * raw_text_size,
+            "date_created": (now - timedelta(minutes=i * 7)).isoformat(),
+        }
+
+
+def seed_jobs(engine, count, chunk_size=10_000):
+    with engine.begin() as conn:
+        for start in range(0, count, chunk_size):
+            rows = list(make_rows(min(chunk_size, count - start), start))
+            conn.execute(insert(Job), rows)
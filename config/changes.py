@@ -0,0 +1,15 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Change feed served by /api/jobs/changes.
+# How often an API process re-reads the latest sequence number while
+# consumers are waiting; this is the only query made between ingests.
+CHANGE_FEED_POLL_SECONDS = float(os.getenv("CHANGE_FEED_POLL_SECONDS", 1.0))
+CHANGE_FEED_MAX_WAIT_SECONDS = 30
+CHANGE_FEED_MAX_LIMIT = 1000
+CHANGE_FEED_HEARTBEAT_SECONDS = 15
+
+# Columns whose updates are not reported as changes
+CHANGE_FEED_IGNORED_COLUMNS = ("last_checked", "fingerprint")
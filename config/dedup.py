@@ -0,0 +1,9 @@
+# MinHash / LSH settings for near-duplicate job detection.
+# With 16 bands of 8 rows, pairs above ~0.7 Jaccard similarity almost always
+# share a bucket; candidates are then checked against DEDUP_THRESHOLD.
+DEDUP_NUM_PERM = 128
+DEDUP_BANDS = 16
+DEDUP_ROWS = 8
+DEDUP_SHINGLE_SIZE = 3
+DEDUP_THRESHOLD = 0.85
+DEDUP_SEED = 1337
@@ -0,0 +1,13 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Coordinator/worker settings for distributed scraping.
+QUEUE_LEASE_SECONDS = int(os.getenv("QUEUE_LEASE_SECONDS", 900))
+QUEUE_CLAIM_BATCH_SIZE = int(os.getenv("QUEUE_CLAIM_BATCH_SIZE", 5))
+QUEUE_MAX_ATTEMPTS = int(os.getenv("QUEUE_MAX_ATTEMPTS", 3))
+QUEUE_POLL_SECONDS = int(os.getenv("QUEUE_POLL_SECONDS", 30))
+
+# Minimum gap between two requests to the same host, shared by all workers.
+POLITENESS_INTERVAL_SECONDS = float(os.getenv("POLITENESS_INTERVAL_SECONDS", 3.5))
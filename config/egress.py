@@ -0,0 +1,26 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Adaptive (AIMD) rate control per egress identity, in requests per second.
+# The initial rate matches the old fixed 2-5 second delay between requests.
+EGRESS_INITIAL_RATE = float(os.getenv("EGRESS_INITIAL_RATE", 0.3))
+EGRESS_MIN_RATE = float(os.getenv("EGRESS_MIN_RATE", 0.02))
+EGRESS_MAX_RATE = float(os.getenv("EGRESS_MAX_RATE", 2.0))
+EGRESS_RATE_INCREASE = float(os.getenv("EGRESS_RATE_INCREASE", 0.02))
+EGRESS_RATE_DECREASE = 0.5
+# A response this many times slower than the identity's average counts as
+# a sign of overload and slows the identity down
+EGRESS_SLOW_RESPONSE_FACTOR = 3.0
+EGRESS_SLOW_RESPONSE_DECREASE = 0.8
+
+# Identities answered with these codes are benched for a cool-down period
+# that doubles with every consecutive ban
+EGRESS_BAN_STATUS_CODES = (403,)
+EGRESS_THROTTLE_STATUS_CODES = (429, 503)
+EGRESS_COOLDOWN_SECONDS = int(os.getenv("EGRESS_COOLDOWN_SECONDS", 600))
+EGRESS_MAX_COOLDOWN_SECONDS = 6 * 60 * 60
+# Longest a request waits for an identity. When every identity is cooling
+# down for longer, fetching stops instead of sleeping through the ban.
+EGRESS_MAX_WAIT_SECONDS = int(os.getenv("EGRESS_MAX_WAIT_SECONDS", 120))
@@ -0,0 +1,12 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Columnar export written by scripts/export_parquet.py
+EXPORT_DIR = os.getenv("EXPORT_DIR", "data/export")
+# Rows fetched from the database and written as one Parquet row group
+EXPORT_BATCH_SIZE = 5000
+EXPORT_COMPRESSION = "zstd"
+# Partition for jobs without a date_created
+EXPORT_UNKNOWN_PARTITION = "unknown"
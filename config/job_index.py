@@ -0,0 +1,13 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Optional in-memory copy of the jobs table served by the API
+JOB_INDEX_ENABLED = os.getenv("JOB_INDEX_ENABLED", "false").lower() == "true"
+# The index turns itself off above this many jobs and the API goes back to SQL
+JOB_INDEX_MAX_JOBS = int(os.getenv("JOB_INDEX_MAX_JOBS", 20000))
+JOB_INDEX_LOAD_BATCH_SIZE = 1000
+JOB_INDEX_KEYWORD_CACHE_SIZE = 256
+# Kept out of memory and fetched by primary key for the page being served
+JOB_INDEX_EXCLUDED_FIELDS = ("raw_text",)
@@ -0,0 +1,60 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Stored as the summary when the LLM call fails
+SUMMARY_FAILED = "Summary generation failed"
+
+# Sent once as the system instruction (Gemini) or system message (DeepSeek)
+# rather than repeated in every prompt
+SUMMARY_SYSTEM_INSTRUCTION = """You are a job summarization assistant.
+
+You get the details of a job posting. Write a compact, Telegram-ready job notification message that is:
+1. Scannable on mobile.
+2. Concise (no more than ~150 words).
+3. Made of these sections:
+- Job Title & Focus
+- Type & Hours
+- Salary
+- Company / Industry (optional)
+- Key Responsibilities (2-3 bullets max)
+- Key Requirements (2-3 bullets max)
+- Bonus Skills (if relevant)
+- Link / CTA (if provided)
+
+Use short, clear bullet points where appropriate. Keep formatting readable and professional. Do not include unnecessary details.
+IMPORTANT:
+- Do NOT include any preamble, introduction, or phrases like "Here is a compact Telegram-ready job summary" or "Summary:".
+- Start directly with the job title.
+- Format it using plain text, no markdown.
+- Output ONLY the final Telegram message in the requested format."""
+
+# Estimated tokens allowed for the job part of a summary prompt. The
+# instructions are sent separately as a system instruction.
+SUMMARY_PROMPT_TOKEN_BUDGET = int(os.getenv("SUMMARY_PROMPT_TOKEN_BUDGET", 400))
+# Rough chars-per-token ratio of English text for the common tokenizers
+CHARS_PER_TOKEN = 4
+
+# Whole lines that carry nothing for a summary (greetings and sign-offs).
+# Application instructions are kept on purpose: they often hold a keyword
+# applicants must use.
+BOILERPLATE_PATTERNS = [
+    r"^(hi|hello|hey|greetings|good day)( there| everyone| all)?[!.,]*$",
+    r"^(thank you|thanks)( so much| very much| for reading| for your time)?[!.]*$",
+    r"^(thank you|thanks)( and| &) (good luck|god bless)[!.]*$",
+    r"^(good luck|god bless|cheers|best regards|regards)[!.,]*$",
+    r"^(we )?look(ing)? forward to (hearing from|working with) you[!.]*$",
+    r"^only shortlisted (candidates|applicants) will be (contacted|notified)[!.]*$",
+]
+
+# Section headers whose lines matter most for the summary, and those that
+# matter somewhat; everything else ranks below them
+PRIMARY_SECTION_PATTERN = (
+    r"responsib|duties|tasks|requirement|qualif|what you('ll| will)|"
+    r"what we need|what we('re| are) looking for|must have|skills|the role|about the job"
+)
+SECONDARY_SECTION_PATTERN = (
+    r"nice to have|bonus|preferred|plus|benefit|perks|schedule|hours|"
+    r"apply|application|compensation|pay"
+)
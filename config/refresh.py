@@ -0,0 +1,12 @@
+# Refresh tiers as (max posting age in days, days between checks).
+# Younger postings are edited and closed more often, so they are checked
+# first and more frequently.
+REFRESH_TIERS = [
+    (3, 1),
+    (14, 3),
+    (60, 7),
+    (None, 30),
+]
+
+REFRESH_DEFAULT_LIMIT = 200
+REFRESH_CLOSED_STATUS_CODES = (404, 410)
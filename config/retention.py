@@ -0,0 +1,14 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Postings are moved from jobs to jobs_archive once they were posted more
+# than ARCHIVE_AFTER_DAYS ago, or closed more than ARCHIVE_CLOSED_AFTER_DAYS
+# ago (the delay lets API clients see the closing date first)
+ARCHIVE_AFTER_DAYS = int(os.getenv("ARCHIVE_AFTER_DAYS", 90))
+ARCHIVE_CLOSED_AFTER_DAYS = int(os.getenv("ARCHIVE_CLOSED_AFTER_DAYS", 7))
+# Jobs moved per transaction, so writers are never blocked for long
+ARCHIVE_BATCH_SIZE = 500
+# VACUUM the local database once this share of its pages is free
+VACUUM_MIN_FREE_RATIO = 0.2
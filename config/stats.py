@@ -0,0 +1,28 @@
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# Buckets of the job_stats_daily rollup. Changing them requires
+# `python -m scripts.rebuild_stats` so stored counts match the new bands.
+UNSPECIFIED = "unspecified"
+
+# Monthly pay in USD: (lower bound, label), checked from the top
+SALARY_BANDS = [
+    (2500, "$2500+"),
+    (1500, "$1500-2499"),
+    (1000, "$1000-1499"),
+    (500, "$500-999"),
+    (0, "<$500"),
+]
+# Weekly hours: (lower bound, label), checked from the top
+HOURS_BANDS = [
+    (40, "40+"),
+    (30, "30-39"),
+    (20, "20-29"),
+    (0, "<20"),
+]
+
+PHP_PER_USD = float(os.getenv("PHP_PER_USD", 58))
+DEFAULT_HOURS_PER_WEEK = 40
+WEEKS_PER_MONTH = 52 / 12
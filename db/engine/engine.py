@@ -1,10 +1,31 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 import os
 from dotenv import load_dotenv
+from services.metrics.metrics import instrument_engine
 
 
-def engine_init_local():
-    return create_engine("sqlite:///data/olj-scraper.db")
+def apply_sqlite_pragmas(engine):
+    load_dotenv()
+    mmap_size = int(os.environ.get("SQLITE_MMAP_SIZE", 256 * 1024 * 1024))
+    cache_size_kb = int(os.environ.get("SQLITE_CACHE_SIZE_KB", 64 * 1024))
+
+    @event.listens_for(engine, "connect")
+    def _set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        cursor.execute("PRAGMA journal_mode=WAL")
+        cursor.execute("PRAGMA synchronous=NORMAL")
+        cursor.execute(f"PRAGMA mmap_size={mmap_size}")
+        # Negative values are in KiB rather than pages
+        cursor.execute(f"PRAGMA cache_size=-{cache_size_kb}")
+        cursor.execute("PRAGMA busy_timeout=5000")
+        cursor.close()
+
+    return engine
+
+
+def engine_init_local(url=None):
+    url = url or os.environ.get("LOCAL_DATABASE_URL", "sqlite:///data/olj-scraper.db")
+    return instrument_engine(apply_sqlite_pragmas(create_engine(url)))
 
 
 def engine_init_remote():
@@ -17,5 +38,8 @@ def engine_init_remote():
         connect_args={
             "auth_token": TURSO_AUTH_TOKEN,
         },
+        # Turso drops idle streams, check connections before handing them out
+        pool_pre_ping=True,
+        pool_recycle=300,
     )
-    return engine
+    return instrument_engine(engine)
@@ -0,0 +1,72 @@
+import atexit
+import os
+import threading
+from db.engine.engine import engine_init_local, engine_init_remote
+from db.session.session import create_session_factory
+
+_engines = {}
+_session_factories = {}
+_lock = threading.Lock()
+
+
+def resolve_env(args=None) -> str:
+    # Command line entry points use the local database unless --prod is
+    # given; the API chooses its database from API_ENV itself
+    if args is not None and getattr(args, "prod", False):
+        return "prod"
+    return "dev"
+
+
+def get_engine(env=None):
+    """
+    Process-wide engine for ``env`` ("dev" = local SQLite, "prod" = Turso),
+    created on first use and shared by every caller afterwards.
+    """
+    env = env or resolve_env()
+    with _lock:
+        if env not in _engines:
+            _engines[env] = engine_init_remote() if env == "prod" else engine_init_local()
+        return _engines[env]
+
+
+def get_session_factory(env=None):
+    env = env or resolve_env()
+    engine = get_engine(env)
+    with _lock:
+        if env not in _session_factories:
+            _session_factories[env] = create_session_factory(engine)
+        return _session_factories[env]
+
+
+def reset_engine(env=None):
+    env = env or resolve_env()
+    with _lock:
+        engine = _engines.pop(env, None)
+        _session_factories.pop(env, None)
+    if engine is not None:
+        engine.dispose()
+
+
+def dispose_engines():
+    with _lock:
+        engines = list(_engines.values())
+        _engines.clear()
+        _session_factories.clear()
+    for engine in engines:
+        engine.dispose()
+
+
+def _forget_engines_after_fork():
+    # Pooled connections must not be shared with a forked child, which opens
+    # its own on first use
+    global _lock
+    _lock = threading.Lock()
+    for engine in _engines.values():
+        engine.dispose(close=False)
+    _engines.clear()
+    _session_factories.clear()
+
+
+atexit.register(dispose_engines)
+if hasattr(os, "register_at_fork"):
+    os.register_at_fork(after_in_child=_forget_engines_after_fork)
@@ -0,0 +1,29 @@
+from sqlalchemy import Column, Index, Integer, String, Text
+from db.models.Base import Base
+
+
+class ArchivedJob(Base):
+    """Expired and closed postings moved out of ``jobs``; same columns."""
+
+    __tablename__ = "jobs_archive"
+
+    job_id = Column(String, primary_key=True)
+    # The id the job had in ``jobs``; SQLite may hand it out again there
+    id = Column(Integer, nullable=False)
+    title = Column(String, nullable=False)
+    work_type = Column(String, nullable=True)
+    salary = Column(String, nullable=True)
+    hours_per_week = Column(String, nullable=True)
+    job_overview = Column(Text, nullable=True)
+    summary = Column(Text, nullable=True)
+    link = Column(String, nullable=True)
+    raw_text = Column(Text, nullable=True)
+    date_created = Column(String, nullable=True)
+    fingerprint = Column(String, nullable=True)
+    date_updated = Column(String, nullable=True)
+    last_checked = Column(String, nullable=True)
+    date_closed = Column(String, nullable=True)
+    duplicate_of = Column(String, nullable=True)
+    archived_at = Column(String, nullable=True)
+
+    __table_args__ = (Index("ix_jobs_archive_date_created", "date_created"),)
@@ -0,0 +1,9 @@
+from sqlalchemy import Column, Float, String
+from db.models.Base import Base
+
+
+class HostRateLimit(Base):
+    __tablename__ = "host_rate_limits"
+
+    host = Column(String, primary_key=True)
+    next_allowed_at = Column(Float, nullable=False)
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, Text
+from sqlalchemy import Column, Index, Integer, String, Text, or_
 from db.models.Base import Base
 
 
@@ -16,6 +16,29 @@ class Job(Base):
     link = Column(String, nullable=True)
     raw_text = Column(Text, nullable=True)
     date_created = Column(String, nullable=True)
+    fingerprint = Column(String, nullable=True)
+    date_updated = Column(String, nullable=True)
+    last_checked = Column(String, nullable=True)
+    date_closed = Column(String, nullable=True)
+    duplicate_of = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ix_jobs_date_created", "date_created"),
+        Index("ix_jobs_refresh", "date_closed", "last_checked"),
+        # Partial index over the rows the null cleanup deletes, so the cleanup
+        # never has to scan the whole table
+        Index(
+            "ix_jobs_missing_fields",
+            id,
+            sqlite_where=or_(
+                title.is_(None),
+                work_type.is_(None),
+                salary.is_(None),
+                hours_per_week.is_(None),
+                job_overview.is_(None),
+            ),
+        ),
+    )
 
     def __str__(self):
         return f"""
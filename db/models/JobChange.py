@@ -0,0 +1,15 @@
+from sqlalchemy import Column, Integer, String
+from db.models.Base import Base
+
+
+class JobChange(Base):
+    __tablename__ = "job_changes"
+
+    # AUTOINCREMENT keeps seq strictly increasing even after old rows are
+    # deleted, so it can be handed out as a resume token
+    seq = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, nullable=False)
+    op = Column(String, nullable=False)
+    changed_at = Column(String, nullable=False)
+
+    __table_args__ = {"sqlite_autoincrement": True}
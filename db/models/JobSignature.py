@@ -0,0 +1,9 @@
+from sqlalchemy import Column, LargeBinary, String
+from db.models.Base import Base
+
+
+class JobSignature(Base):
+    __tablename__ = "job_signatures"
+
+    job_id = Column(String, primary_key=True)
+    signature = Column(LargeBinary, nullable=False)
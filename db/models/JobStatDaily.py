@@ -0,0 +1,14 @@
+from sqlalchemy import Column, Integer, String
+from db.models.Base import Base
+
+
+class JobStatDaily(Base):
+    __tablename__ = "job_stats_daily"
+
+    # One row per posting day and bucket, kept up to date as jobs are
+    # inserted, changed and deleted
+    day = Column(String, primary_key=True)
+    work_type = Column(String, primary_key=True)
+    salary_band = Column(String, primary_key=True)
+    hours_band = Column(String, primary_key=True)
+    count = Column(Integer, nullable=False, default=0)
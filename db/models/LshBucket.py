@@ -0,0 +1,16 @@
+from sqlalchemy import Column, Index, Integer, String
+from db.models.Base import Base
+
+
+class LshBucket(Base):
+    __tablename__ = "lsh_buckets"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    band = Column(Integer, nullable=False)
+    bucket = Column(String, nullable=False)
+    job_id = Column(String, nullable=False)
+
+    __table_args__ = (
+        Index("ix_lsh_buckets_band_bucket", "band", "bucket"),
+        Index("ix_lsh_buckets_job_id", "job_id"),
+    )
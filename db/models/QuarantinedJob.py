@@ -0,0 +1,13 @@
+from sqlalchemy import Column, Integer, String, Text
+from db.models.Base import Base
+
+
+class QuarantinedJob(Base):
+    __tablename__ = "quarantined_jobs"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    job_id = Column(String, unique=True, nullable=False)
+    link = Column(String, nullable=True)
+    reason = Column(String, nullable=False)
+    raw_text = Column(Text, nullable=True)
+    date_created = Column(String, nullable=True)
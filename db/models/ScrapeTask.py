@@ -0,0 +1,21 @@
+from sqlalchemy import Column, Float, Index, Integer, String, Text
+from db.models.Base import Base
+
+
+class ScrapeTask(Base):
+    __tablename__ = "scrape_queue"
+
+    job_id = Column(String, primary_key=True)
+    url = Column(String, nullable=False)
+    status = Column(String, nullable=False, default="pending")
+    lease_owner = Column(String, nullable=True)
+    lease_expires = Column(Float, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    last_error = Column(Text, nullable=True)
+    enqueued_at = Column(String, nullable=True)
+    finished_at = Column(String, nullable=True)
+
+    __table_args__ = (
+        Index("ix_scrape_queue_status_lease", "status", "lease_expires"),
+        Index("ix_scrape_queue_lease_owner", "lease_owner"),
+    )
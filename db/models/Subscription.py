@@ -0,0 +1,18 @@
+from sqlalchemy import Boolean, Column, Float, Integer, String
+from db.models.Base import Base
+
+
+class Subscription(Base):
+    __tablename__ = "subscriptions"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    name = Column(String, nullable=False)
+    # Comma-separated; every keyword (or phrase) must appear in the title or
+    # overview as whole words
+    keywords = Column(String, nullable=True)
+    work_type = Column(String, nullable=True)
+    # Monthly pay in USD, compared with utils.bands.monthly_usd
+    min_salary = Column(Float, nullable=True)
+    max_salary = Column(Float, nullable=True)
+    active = Column(Boolean, nullable=False, default=True)
+    created_at = Column(String, nullable=True)
@@ -0,0 +1,20 @@
+from sqlalchemy import Column, Float, Index, Integer, String, Text
+from db.models.Base import Base
+
+
+class WebhookOutbox(Base):
+    __tablename__ = "webhook_outbox"
+
+    id = Column(Integer, primary_key=True, autoincrement=True)
+    event = Column(String, nullable=False)
+    payload = Column(Text, nullable=False)
+    created_at = Column(String, nullable=True)
+    attempts = Column(Integer, nullable=False, default=0)
+    next_attempt_at = Column(Float, nullable=False, default=0.0)
+    claimed_by = Column(String, nullable=True)
+    delivered_at = Column(String, nullable=True)
+    last_error = Column(Text, nullable=True)
+
+    __table_args__ = (
+        Index("ix_webhook_outbox_pending", "delivered_at", "next_attempt_at"),
+    )
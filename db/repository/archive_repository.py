@@ -0,0 +1,67 @@
+from datetime import datetime
+from sqlalchemy import delete, insert, literal, or_, select, union_all
+from sqlalchemy.orm import aliased
+from db.models.ArchivedJob import ArchivedJob
+from db.models.Job import Job
+from db.repository import change_repository, dedup_repository
+
+JOB_COLUMNS = [column.key for column in Job.__table__.columns]
+
+
+def get_expired_job_ids(session, posted_before, closed_before, limit) -> list[int]:
+    # Each side of the OR is served by an index (ix_jobs_date_created and
+    # ix_jobs_refresh)
+    return (
+        session.scalars(
+            select(Job.id)
+            .where(
+                or_(
+                    Job.date_created < posted_before,
+                    Job.date_closed < closed_before,
+                )
+            )
+            .order_by(Job.id)
+            .limit(limit)
+        )
+        .all()
+    )
+
+
+def archive_jobs(session, ids) -> int:
+    """
+    Move the jobs with these primary keys to jobs_archive. The change feed
+    reports them as archived. The stats rollup keeps counting them. Their
+    near-duplicate signatures are dropped, so the dedup index only covers
+    jobs that are still stored.
+    """
+    now = datetime.now().isoformat()
+    session.execute(
+        insert(ArchivedJob).from_select(
+            [*JOB_COLUMNS, "archived_at"],
+            select(
+                *[getattr(Job, column) for column in JOB_COLUMNS], literal(now)
+            ).where(Job.id.in_(ids)),
+        )
+    )
+    job_ids = (
+        session.execute(delete(Job).where(Job.id.in_(ids)).returning(Job.job_id))
+        .scalars()
+        .all()
+    )
+    change_repository.record_changes(session, job_ids, change_repository.OP_ARCHIVE)
+    dedup_repository.remove_signatures(session, job_ids)
+    return len(job_ids)
+
+
+def is_archived(session, job_id) -> bool:
+    return session.get(ArchivedJob, job_id) is not None
+
+
+def jobs_with_archive():
+    """Job entity over jobs UNION ALL jobs_archive, for queries that ask
+    for archived postings too."""
+    union = union_all(
+        select(*[getattr(Job, column) for column in JOB_COLUMNS]),
+        select(*[getattr(ArchivedJob, column) for column in JOB_COLUMNS]),
+    ).subquery("jobs_with_archive")
+    return aliased(Job, union, adapt_on_names=True)
@@ -0,0 +1,80 @@
+from datetime import datetime
+from sqlalchemy import event, func, inspect
+from config.changes import CHANGE_FEED_IGNORED_COLUMNS
+from db.models.Job import Job
+from db.models.JobChange import JobChange
+
+OP_INSERT = "insert"
+OP_UPDATE = "update"
+OP_DELETE = "delete"
+# Moved to jobs_archive; gone from /api/jobs like a deleted job
+OP_ARCHIVE = "archive"
+
+TRACKED_COLUMNS = [
+    column.key
+    for column in Job.__table__.columns
+    if column.key not in CHANGE_FEED_IGNORED_COLUMNS
+]
+
+
+def record_changes(session, job_ids, op):
+    # For bulk statements, which skip the ORM events below
+    now = datetime.now().isoformat()
+    session.add_all(
+        JobChange(job_id=job_id, op=op, changed_at=now) for job_id in job_ids
+    )
+
+
+def get_changes(session, since, limit):
+    return (
+        session.query(JobChange, Job)
+        .outerjoin(Job, Job.job_id == JobChange.job_id)
+        .filter(JobChange.seq > since)
+        .order_by(JobChange.seq)
+        .limit(limit)
+        .all()
+    )
+
+
+def get_changed_jobs(session, since, until):
+    """
+    (job_id, id, date_created) of the jobs changed in (since, until];
+    id is None once a job has been deleted.
+    """
+    return (
+        session.query(JobChange.job_id, Job.id, Job.date_created)
+        .outerjoin(Job, Job.job_id == JobChange.job_id)
+        .filter(JobChange.seq > since, JobChange.seq <= until)
+        .all()
+    )
+
+
+def get_latest_seq(session) -> int:
+    return session.query(func.max(JobChange.seq)).scalar() or 0
+
+
+def _log_change(connection, job_id, op):
+    connection.execute(
+        JobChange.__table__.insert().values(
+            job_id=job_id, op=op, changed_at=datetime.now().isoformat()
+        )
+    )
+
+
+# The change rows are written on the flush's connection, so they commit or
+# roll back together with the job itself
+@event.listens_for(Job, "after_insert")
+def _job_inserted(mapper, connection, target):
+    _log_change(connection, target.job_id, OP_INSERT)
+
+
+@event.listens_for(Job, "after_update")
+def _job_updated(mapper, connection, target):
+    state = inspect(target)
+    if any(state.attrs[key].history.has_changes() for key in TRACKED_COLUMNS):
+        _log_change(connection, target.job_id, OP_UPDATE)
+
+
+@event.listens_for(Job, "after_delete")
+def _job_deleted(mapper, connection, target):
+    _log_change(connection, target.job_id, OP_DELETE)
@@ -0,0 +1,58 @@
+from sqlalchemy import and_, or_
+from db.models.Job import Job
+from db.models.JobSignature import JobSignature
+from db.models.LshBucket import LshBucket
+
+
+def add_signature(session, job_id, signature: bytes, buckets):
+    session.add(JobSignature(job_id=job_id, signature=signature))
+    session.add_all(
+        [LshBucket(band=band, bucket=bucket, job_id=job_id) for band, bucket in buckets]
+    )
+
+
+def remove_signatures(session, job_ids):
+    if not job_ids:
+        return
+    session.query(LshBucket).filter(LshBucket.job_id.in_(job_ids)).delete(
+        synchronize_session=False
+    )
+    session.query(JobSignature).filter(JobSignature.job_id.in_(job_ids)).delete(
+        synchronize_session=False
+    )
+
+
+def get_candidates(session, buckets) -> list[tuple[str, bytes]]:
+    candidate_ids = (
+        session.query(LshBucket.job_id)
+        .filter(
+            or_(
+                *[
+                    and_(LshBucket.band == band, LshBucket.bucket == bucket)
+                    for band, bucket in buckets
+                ]
+            )
+        )
+        .distinct()
+    )
+    return (
+        session.query(JobSignature.job_id, JobSignature.signature)
+        .filter(JobSignature.job_id.in_(candidate_ids))
+        .all()
+    )
+
+
+def get_unindexed_jobs(session, after_id, batch_size):
+    return (
+        session.query(Job)
+        .outerjoin(JobSignature, JobSignature.job_id == Job.job_id)
+        .filter(
+            Job.id > after_id,
+            JobSignature.job_id.is_(None),
+            Job.job_overview.is_not(None),
+            Job.duplicate_of.is_(None),
+        )
+        .order_by(Job.id)
+        .limit(batch_size)
+        .all()
+    )
@@ -1,5 +1,9 @@
 from db.models.Job import Job
 
+# Register the listeners that keep the job_changes log and the
+# job_stats_daily rollup in sync
+from db.repository import change_repository, stats_repository  # noqa: F401
+
 
 def add_job(session, job: Job):
     session.add(job)
@@ -15,3 +19,10 @@ def get_all_jobs(session) -> list[Job]:
 
 def get_job_by_job_id(session, job_id) -> Job | None:
     return session.query(Job).filter(Job.job_id == job_id).first()
+
+
+def get_existing_job_ids(session, job_ids) -> set[str]:
+    if not job_ids:
+        return set()
+    rows = session.query(Job.job_id).filter(Job.job_id.in_(job_ids)).all()
+    return {row.job_id for row in rows}
@@ -0,0 +1,81 @@
+import time
+from datetime import datetime, timedelta
+from db.models.WebhookOutbox import WebhookOutbox
+
+
+def add_event(session, event, payload: str):
+    session.add(
+        WebhookOutbox(
+            event=event,
+            payload=payload,
+            created_at=datetime.now().isoformat(),
+            attempts=0,
+            next_attempt_at=0.0,
+        )
+    )
+
+
+def claim_pending(session, claimed_by, limit, lease_seconds=120) -> list[WebhookOutbox]:
+    now = time.time()
+    pending_ids = (
+        session.query(WebhookOutbox.id)
+        .filter(
+            WebhookOutbox.delivered_at.is_(None),
+            WebhookOutbox.next_attempt_at <= now,
+        )
+        .order_by(WebhookOutbox.id)
+        .limit(limit)
+        .scalar_subquery()
+    )
+    session.query(WebhookOutbox).filter(
+        WebhookOutbox.id.in_(pending_ids),
+        WebhookOutbox.next_attempt_at <= now,
+    ).update(
+        {
+            WebhookOutbox.claimed_by: claimed_by,
+            WebhookOutbox.next_attempt_at: now + lease_seconds,
+        },
+        synchronize_session=False,
+    )
+    session.commit()
+    return (
+        session.query(WebhookOutbox)
+        .filter(
+            WebhookOutbox.claimed_by == claimed_by,
+            WebhookOutbox.delivered_at.is_(None),
+        )
+        .order_by(WebhookOutbox.id)
+        .all()
+    )
+
+
+def mark_delivered(session, entries):
+    now = datetime.now().isoformat()
+    for entry in entries:
+        entry.delivered_at = now
+        entry.attempts += 1
+        entry.last_error = None
+    session.commit()
+
+
+def mark_failed(session, entries, error, retry_in):
+    for entry in entries:
+        entry.attempts += 1
+        entry.last_error = error
+        entry.claimed_by = None
+        entry.next_attempt_at = time.time() + retry_in
+    session.commit()
+
+
+def prune_delivered(session, older_than_days=7) -> int:
+    cutoff = (datetime.now() - timedelta(days=older_than_days)).isoformat()
+    deleted = (
+        session.query(WebhookOutbox)
+        .filter(
+            WebhookOutbox.delivered_at.is_not(None),
+            WebhookOutbox.delivered_at < cutoff,
+        )
+        .delete(synchronize_session=False)
+    )
+    session.commit()
+    return deleted
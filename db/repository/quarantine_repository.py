@@ -0,0 +1,37 @@
+from datetime import datetime
+from db.models.QuarantinedJob import QuarantinedJob
+
+QUARANTINE_MAX_ROWS = 500
+QUARANTINE_MAX_RAW_TEXT = 64 * 1024
+
+
+def quarantine_job(session, job, reason):
+    entry = (
+        session.query(QuarantinedJob)
+        .filter(QuarantinedJob.job_id == job.job_id)
+        .first()
+    )
+    if entry is None:
+        entry = QuarantinedJob(job_id=job.job_id)
+        session.add(entry)
+    entry.link = job.link
+    entry.reason = reason
+    entry.raw_text = (job.raw_text or "")[:QUARANTINE_MAX_RAW_TEXT]
+    entry.date_created = datetime.now().isoformat()
+
+
+def prune_quarantine(session, max_rows=QUARANTINE_MAX_ROWS) -> int:
+    cutoff = (
+        session.query(QuarantinedJob.id)
+        .order_by(QuarantinedJob.id.desc())
+        .offset(max_rows)
+        .limit(1)
+        .scalar()
+    )
+    if cutoff is None:
+        return 0
+    return (
+        session.query(QuarantinedJob)
+        .filter(QuarantinedJob.id <= cutoff)
+        .delete(synchronize_session=False)
+    )
@@ -0,0 +1,148 @@
+from datetime import datetime
+from sqlalchemy import func, text
+from sqlalchemy.dialects.sqlite import insert
+from db.models.HostRateLimit import HostRateLimit
+from db.models.ScrapeTask import ScrapeTask
+
+# Seconds since the epoch according to the database, so that leases and rate
+# limits agree across hosts whose clocks drift
+DB_NOW = "((julianday('now') - 2440587.5) * 86400.0)"
+
+
+def enqueue_links(session, links) -> int:
+    if not links:
+        return 0
+    now = datetime.now().isoformat()
+    result = session.execute(
+        insert(ScrapeTask)
+        .values(
+            [
+                {
+                    "job_id": link.job_id,
+                    "url": link.url,
+                    "status": "pending",
+                    "attempts": 0,
+                    "enqueued_at": now,
+                }
+                for link in links
+            ]
+        )
+        .on_conflict_do_nothing(index_elements=["job_id"])
+    )
+    return result.rowcount
+
+
+def claim_tasks(session, lease_owner, batch_size, lease_seconds, max_attempts):
+    session.execute(
+        text(
+            f"""
+            UPDATE scrape_queue
+            SET status = 'leased',
+                lease_owner = :lease_owner,
+                lease_expires = {DB_NOW} + :lease_seconds,
+                attempts = attempts + 1
+            WHERE job_id IN (
+                SELECT job_id FROM scrape_queue
+                WHERE attempts < :max_attempts
+                  AND (status = 'pending'
+                       OR (status = 'leased' AND lease_expires < {DB_NOW}))
+                ORDER BY enqueued_at
+                LIMIT :batch_size
+            )
+            """
+        ),
+        {
+            "lease_owner": lease_owner,
+            "lease_seconds": lease_seconds,
+            "max_attempts": max_attempts,
+            "batch_size": batch_size,
+        },
+    )
+    session.commit()
+    return (
+        session.query(ScrapeTask)
+        .filter(ScrapeTask.lease_owner == lease_owner, ScrapeTask.status == "leased")
+        .all()
+    )
+
+
+def finish_task(session, task: ScrapeTask, status, error=None):
+    task.status = status
+    task.last_error = error
+    task.lease_expires = None
+    task.finished_at = datetime.now().isoformat()
+
+
+def release_task(session, task: ScrapeTask, error=None):
+    task.status = "pending"
+    task.lease_owner = None
+    task.lease_expires = None
+    task.last_error = error
+
+
+def release_lease(session, lease_owner, error=None) -> int:
+    """Put the tasks of a batch that are still leased back on the queue."""
+    result = session.execute(
+        text(
+            """
+            UPDATE scrape_queue
+            SET status = 'pending', lease_owner = NULL, lease_expires = NULL,
+                last_error = :error
+            WHERE lease_owner = :lease_owner AND status = 'leased'
+            """
+        ),
+        {"lease_owner": lease_owner, "error": error},
+    )
+    session.commit()
+    return result.rowcount
+
+
+def fail_exhausted_tasks(session, max_attempts) -> int:
+    result = session.execute(
+        text(
+            f"""
+            UPDATE scrape_queue SET status = 'failed'
+            WHERE attempts >= :max_attempts
+              AND (status = 'pending'
+                   OR (status = 'leased' AND lease_expires < {DB_NOW}))
+            """
+        ),
+        {"max_attempts": max_attempts},
+    )
+    session.commit()
+    return result.rowcount
+
+
+def count_by_status(session) -> dict:
+    rows = (
+        session.query(ScrapeTask.status, func.count())
+        .group_by(ScrapeTask.status)
+        .all()
+    )
+    return {status: count for status, count in rows}
+
+
+def reserve_host_slot(session, host, interval) -> float:
+    """
+    Reserve the next request slot for ``host`` and return how many seconds
+    the caller has to wait for it. Every worker goes through the same row,
+    so the combined request rate to a host never exceeds one per interval.
+    """
+    session.execute(
+        insert(HostRateLimit)
+        .values(host=host, next_allowed_at=0.0)
+        .on_conflict_do_nothing(index_elements=["host"])
+    )
+    wait = session.execute(
+        text(
+            f"""
+            UPDATE host_rate_limits
+            SET next_allowed_at = MAX(next_allowed_at, {DB_NOW}) + :interval
+            WHERE host = :host
+            RETURNING next_allowed_at - :interval - {DB_NOW}
+            """
+        ),
+        {"host": host, "interval": interval},
+    ).scalar()
+    session.commit()
+    return max(0.0, wait or 0.0)
@@ -0,0 +1,166 @@
+from collections import Counter
+from sqlalchemy import bindparam, event, func, inspect, select, union_all, update
+from sqlalchemy.dialects.sqlite import insert
+from config.stats import UNSPECIFIED
+from db.models.ArchivedJob import ArchivedJob
+from db.models.Job import Job
+from db.models.JobStatDaily import JobStatDaily
+from utils.bands import hours_band, salary_band
+
+# Job columns the buckets are derived from
+SOURCE_COLUMNS = ("date_created", "work_type", "salary", "hours_per_week")
+DIMENSIONS = ("work_type", "salary_band", "hours_band")
+INTERVALS = ("day", "week", "month")
+
+
+def bucket_key(date_created, work_type, salary, hours_per_week) -> tuple:
+    return (
+        (date_created or "")[:10] or UNSPECIFIED,
+        work_type or UNSPECIFIED,
+        salary_band(salary, hours_per_week),
+        hours_band(hours_per_week),
+    )
+
+
+def _upsert_statement(counts: Counter):
+    statement = insert(JobStatDaily).values(
+        [
+            {
+                "day": day,
+                "work_type": work_type,
+                "salary_band": salary,
+                "hours_band": hours,
+                "count": delta,
+            }
+            for (day, work_type, salary, hours), delta in counts.items()
+        ]
+    )
+    return statement.on_conflict_do_update(
+        index_elements=["day", "work_type", "salary_band", "hours_band"],
+        set_={"count": JobStatDaily.count + statement.excluded.count},
+    )
+
+
+def _decrement_statement():
+    table = JobStatDaily.__table__
+    # Never below zero, a job counted before the rollup existed may be
+    # removed before the rollup is rebuilt
+    return (
+        update(table)
+        .where(
+            table.c.day == bindparam("b_day"),
+            table.c.work_type == bindparam("b_work_type"),
+            table.c.salary_band == bindparam("b_salary_band"),
+            table.c.hours_band == bindparam("b_hours_band"),
+        )
+        .values(count=func.max(table.c.count - bindparam("b_amount"), 0))
+    )
+
+
+def apply_counts(connection, counts: Counter):
+    increments = Counter({key: delta for key, delta in counts.items() if delta > 0})
+    if increments:
+        connection.execute(_upsert_statement(increments))
+
+    # Decrements only update existing buckets, a missing bucket was never
+    # counted in the first place
+    decrements = [
+        {
+            "b_day": day,
+            "b_work_type": work_type,
+            "b_salary_band": salary,
+            "b_hours_band": hours,
+            "b_amount": -delta,
+        }
+        for (day, work_type, salary, hours), delta in counts.items()
+        if delta < 0
+    ]
+    if decrements:
+        connection.execute(_decrement_statement(), decrements)
+
+
+def remove_jobs(session, rows):
+    # For bulk deletes, which skip the ORM events below. ``rows`` holds the
+    # SOURCE_COLUMNS values of the deleted jobs.
+    counts = Counter()
+    for row in rows:
+        counts[bucket_key(*row)] -= 1
+    apply_counts(session.connection(), counts)
+
+
+def rebuild(session, batch_size=1000) -> int:
+    # Archived jobs stay counted, the rollup covers the whole history
+    counts = Counter()
+    rows = session.execute(
+        union_all(
+            *[
+                select(*[getattr(model, column) for column in SOURCE_COLUMNS])
+                for model in (Job, ArchivedJob)
+            ]
+        ).execution_options(yield_per=batch_size)
+    )
+    for row in rows:
+        counts[bucket_key(*row)] += 1
+
+    session.query(JobStatDaily).delete(synchronize_session=False)
+    keys = list(counts)
+    for start in range(0, len(keys), 500):
+        chunk = keys[start : start + 500]
+        session.execute(_upsert_statement(Counter({key: counts[key] for key in chunk})))
+    return len(keys)
+
+
+def get_stats(session, group_by, interval="day", date_from=None, date_to=None):
+    periods = {
+        "day": JobStatDaily.day,
+        "week": func.strftime("%Y-W%W", JobStatDaily.day),
+        "month": func.substr(JobStatDaily.day, 1, 7),
+    }
+    columns = []
+    if "day" in group_by:
+        columns.append(periods[interval].label("period"))
+    columns.extend(
+        getattr(JobStatDaily, dimension)
+        for dimension in DIMENSIONS
+        if dimension in group_by
+    )
+
+    query = session.query(
+        *columns, func.sum(JobStatDaily.count).label("count")
+    ).filter(JobStatDaily.count > 0)
+    if date_from:
+        query = query.filter(JobStatDaily.day >= date_from)
+    if date_to:
+        query = query.filter(JobStatDaily.day <= date_to)
+    if columns:
+        query = query.group_by(*columns).order_by(*columns)
+    return [dict(row._mapping) for row in query.all() if row.count]
+
+
+def _job_key(target):
+    return bucket_key(*[getattr(target, column) for column in SOURCE_COLUMNS])
+
+
+@event.listens_for(Job, "after_insert")
+def _job_inserted(mapper, connection, target):
+    apply_counts(connection, Counter({_job_key(target): 1}))
+
+
+@event.listens_for(Job, "after_update")
+def _job_updated(mapper, connection, target):
+    state = inspect(target)
+    old_values = []
+    for column in SOURCE_COLUMNS:
+        history = state.attrs[column].history
+        old_values.append(
+            history.deleted[0] if history.deleted else getattr(target, column)
+        )
+    old_key = bucket_key(*old_values)
+    new_key = _job_key(target)
+    if old_key != new_key:
+        apply_counts(connection, Counter({old_key: -1, new_key: 1}))
+
+
+@event.listens_for(Job, "after_delete")
+def _job_deleted(mapper, connection, target):
+    apply_counts(connection, Counter({_job_key(target): -1}))
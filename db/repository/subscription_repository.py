@@ -0,0 +1,28 @@
+from datetime import datetime
+from db.models.Subscription import Subscription
+
+
+def add_subscription(session, subscription: Subscription) -> Subscription:
+    subscription.created_at = datetime.now().isoformat()
+    session.add(subscription)
+    return subscription
+
+
+def get_subscriptions(session, active_only=False) -> list[Subscription]:
+    query = session.query(Subscription)
+    if active_only:
+        query = query.filter(Subscription.active.is_(True))
+    return query.order_by(Subscription.id).all()
+
+
+def get_subscription(session, subscription_id) -> Subscription | None:
+    return session.get(Subscription, subscription_id)
+
+
+def delete_subscription(session, subscription_id) -> bool:
+    deleted = (
+        session.query(Subscription)
+        .filter(Subscription.id == subscription_id)
+        .delete(synchronize_session=False)
+    )
+    return deleted > 0
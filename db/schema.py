@@ -0,0 +1,47 @@
+from sqlalchemy import inspect, select, text
+from sqlalchemy.orm import Session
+from db.models.Base import Base
+from db.models.Job import Job
+from db.models.JobStatDaily import JobStatDaily
+from db.repository import stats_repository
+
+
+def upgrade_schema(engine, logger=None):
+    # create_all() never touches tables that already exist, so columns and
+    # indexes added to the models later have to be added here
+    inspector = inspect(engine)
+    with engine.begin() as conn:
+        for table in Base.metadata.sorted_tables:
+            if not inspector.has_table(table.name):
+                continue
+
+            existing_columns = {
+                column["name"] for column in inspector.get_columns(table.name)
+            }
+            for column in table.columns:
+                if column.name in existing_columns:
+                    continue
+                column_type = column.type.compile(dialect=engine.dialect)
+                conn.execute(
+                    text(
+                        f"ALTER TABLE {table.name} ADD COLUMN {column.name} {column_type}"
+                    )
+                )
+                if logger:
+                    logger.info("Added column %s.%s", table.name, column.name)
+
+            for index in table.indexes:
+                index.create(bind=conn, checkfirst=True)
+
+        # The stats rollup is only kept up to date from the moment it exists.
+        # Fill it once for the jobs stored before, otherwise removing them
+        # would subtract from buckets that never counted them.
+        rollup_empty = conn.execute(select(JobStatDaily.day).limit(1)).first() is None
+        has_jobs = conn.execute(select(Job.id).limit(1)).first() is not None
+        if rollup_empty and has_jobs:
+            with Session(bind=conn) as session:
+                buckets = stats_repository.rebuild(session)
+            if logger:
+                logger.info(
+                    "Filled %s with %s buckets", JobStatDaily.__tablename__, buckets
+                )
@@ -1,120 +1,225 @@
-import os
-import random
 import time
 import asyncio
+import multiprocessing
 from typing import List
 from dotenv import load_dotenv
-import requests
 from scraper.scrape_all import scrape_all_job_listings
 from scraper.job_detail_scraper import scrape_job_detail
+from scraper.http_cache import init_http_cache
+from scraper.refresh import refresh_jobs
+from scraper.worker import default_worker_id, run_worker
 from db.models.Job import Job
-from db.session.session import create_session_factory
-from db.engine.engine import engine_init_local, engine_init_remote
-from db.repository import job_repository
-from services.logger.logger_config import Logger
+from db.engine.registry import get_session_factory, resolve_env
+from services.logger.logger_config import Logger, stop_logging
+from services.logger.context import set_run_id
 from services.google_ai.Gemini import (
     init_gemini_client,
     generate_summaries_async,
 )
+from services.dedup.near_duplicates import index_job
+from services.egress.egress import EgressUnavailable
+from services.ingest.pipeline import ingest_jobs
+from services.notifier.webhook import start_delivery
+from db.repository import dedup_repository, queue_repository
+from services.metrics.metrics import PIPELINE_STAGE_SECONDS, export_batch_metrics
 from utils.args_init import init_cli_args
+from config.prompt import SUMMARY_FAILED
+from utils.fingerprint import job_fingerprint
+from utils.archive_jobs import archive_expired_jobs
 from utils.remove_nulls import remove_null_entries
 
 
+def init_session_factory(args, logger):
+    env = resolve_env(args)
+    logger.info("Using %s database", "remote" if env == "prod" else "local")
+    return get_session_factory(env)
+
+
+def run_refresh(args, logger):
+    SessionLocal = init_session_factory(args, logger)
+    cache = None if args.no_cache else init_http_cache()
+
+    start_time = time.time()
+    # Loaded jobs stay usable after the commit below without a new query
+    with SessionLocal(expire_on_commit=False) as session:
+        changed_jobs = refresh_jobs(session, logger, args.refresh_limit, cache)
+
+        dedup_repository.remove_signatures(session, [job.job_id for job in changed_jobs])
+        for job in changed_jobs:
+            if job.duplicate_of is None:
+                index_job(session, job)
+
+        # Committed before the LLM calls so no write transaction stays open
+        # while they run
+        session.commit()
+
+        if changed_jobs:
+            logger.info(
+                "Regenerating summaries for %s changed jobs...", len(changed_jobs)
+            )
+            asyncGemini_client = init_gemini_client()
+            asyncio.run(generate_summaries_async(asyncGemini_client, changed_jobs))
+
+        # A job whose summary failed keeps its old fingerprint, so the next
+        # refresh finds it changed and tries again
+        for job in changed_jobs:
+            if job.summary != SUMMARY_FAILED:
+                job.fingerprint = job_fingerprint(job)
+        session.commit()
+
+    if cache is not None:
+        cache.close()
+    PIPELINE_STAGE_SECONDS.labels("refresh").observe(time.time() - start_time)
+    logger.info("Refresh finished in %.2f seconds", time.time() - start_time)
+    export_batch_metrics(logger)
+
+
+def run_coordinator(args, logger):
+    logger.info("Scraping all job listings...")
+    with PIPELINE_STAGE_SECONDS.labels("discovery").time():
+        job_list = scrape_all_job_listings()
+    logger.info("Scraped %s job listings", len(job_list))
+    if args.test:
+        job_list = job_list[:3]
+
+    SessionLocal = init_session_factory(args, logger)
+    with SessionLocal() as session:
+        enqueued = queue_repository.enqueue_links(session, job_list)
+        session.commit()
+        logger.info("Enqueued %s new jobs", enqueued)
+        logger.info("Queue status: %s", queue_repository.count_by_status(session))
+
+
+def run_worker_process(args, worker_id):
+    logger = Logger("main").get()
+    set_run_id()
+    SessionLocal = init_session_factory(args, logger)
+    cache = None if args.no_cache else init_http_cache()
+    try:
+        run_worker(SessionLocal, logger, worker_id, cache, args.exit_when_idle)
+    finally:
+        if cache is not None:
+            cache.close()
+        export_batch_metrics(logger, job=f"olj_scraper_worker_{worker_id}")
+
+
+def run_worker_child(args, worker_id):
+    try:
+        run_worker_process(args, worker_id)
+    finally:
+        # Child processes exit without running atexit hooks, so the log
+        # queue is flushed here
+        stop_logging()
+
+
+def run_workers(args, logger):
+    base_id = args.worker_id or default_worker_id()
+    if args.workers <= 1:
+        run_worker_process(args, base_id)
+        return
+
+    logger.info("Starting %s worker processes", args.workers)
+    processes = [
+        multiprocessing.Process(
+            target=run_worker_child, args=(args, f"{base_id}-{index}")
+        )
+        for index in range(args.workers)
+    ]
+    for process in processes:
+        process.start()
+    for process in processes:
+        process.join()
+
+
 def main():
     load_dotenv()
     args = init_cli_args()
-    WEBHOOK_URL = os.environ.get("WEBHOOK_URL", "0.0.0.0:8080/webhook/trigger")
 
     logger = Logger("main").get()
-    logger.info(f"Running in {'development' if args.dev else 'production'} mode")
+    run_id = set_run_id()
+    logger.info(
+        "Running in %s mode (run %s)",
+        "development" if args.dev else "production",
+        run_id,
+    )
+
+    if args.refresh:
+        logger.info("Refresh mode enabled: re-checking stored jobs")
+        run_refresh(args, logger)
+        return
+
+    if args.coordinator:
+        logger.info("Coordinator mode enabled: filling the scrape queue")
+        run_coordinator(args, logger)
+        return
+
+    if args.worker:
+        logger.info("Worker mode enabled: scraping jobs from the queue")
+        run_workers(args, logger)
+        return
 
     start_time_scraping = time.time()
     logger.info("Starting job scraper application")
     try:
         logger.info("Scraping all job listings...")
-        job_list = scrape_all_job_listings()
-        logger.info(f"Scraped {len(job_list)} job listings")
+        with PIPELINE_STAGE_SECONDS.labels("discovery").time():
+            job_list = scrape_all_job_listings()
+        logger.info("Scraped %s job listings", len(job_list))
     except Exception as e:
-        logger.error(f"An error occurred: {e}")
+        logger.error("An error occurred: %s", e)
 
     if args.test:
         logger.info("Test mode enabled: Limiting to 3 jobs")
         job_list = job_list[:3]
 
-    jobs: List[Job] = []
-    for index, job in enumerate(job_list, start=1):
-        jobDetail = scrape_job_detail(
-            job.job_id,
-            index,
-            logger,
-        )
-        if not jobDetail:
-            continue
-        jobs.append(jobDetail)
-        time.sleep(random.uniform(2, 5))
+    cache = None if args.no_cache else init_http_cache()
 
-    logger.info("Inserting jobs into the database...")
-    if args.prod:
-        logger.info("Using remote database")
-        engine = engine_init_remote()
-        SessionLocal = create_session_factory(engine)
-    else:
-        logger.info("Using local database")
-        engine = engine_init_local()
-        SessionLocal = create_session_factory(engine)
-
-    logger.info("Filtering out jobs that already exist in the database...")
-    with SessionLocal() as session:
-        new_jobs: List[Job] = []
-        for job in jobs:
-            existing_job = job_repository.get_job_by_job_id(session, job.job_id)
-            if existing_job:
-                logger.warning(
-                    f"Job with job_id {job.job_id} already exists. Skipping insertion."
+    jobs: List[Job] = []
+    with PIPELINE_STAGE_SECONDS.labels("fetch").time():
+        for index, job in enumerate(job_list, start=1):
+            try:
+                jobDetail = scrape_job_detail(
+                    job.job_id,
+                    index,
+                    logger,
+                    cache,
                 )
+            except EgressUnavailable as e:
+                logger.error("%s, storing the %s jobs fetched so far", e, len(jobs))
+                break
+            if not jobDetail:
                 continue
-            new_jobs.append(job)
-
-        logger.info(f"Found {len(new_jobs)} new jobs to insert")
-        logger.info("Generating job summaries asynchronously...")
-        start_time = time.time()
-        asyncGemini_client = init_gemini_client()
-        asyncio.run(generate_summaries_async(asyncGemini_client, new_jobs))
-        end_time = time.time()
-        logger.info(
-            f"Generated {len(new_jobs)} summaries in {end_time - start_time:.2f} seconds"
-        )
+            jobs.append(jobDetail)
 
-        jobs_added = 0
-        for job in new_jobs:
-            try:
-                job_repository.add_job(session, job)
-                jobs_added += 1
-            except Exception as e:
-                logger.error(f"Error adding job {job.job_id}: {e}")
-                continue
+    if cache is not None:
+        cache.close()
 
-        session.commit()
+    logger.info("Inserting jobs into the database...")
+    SessionLocal = init_session_factory(args, logger)
+
+    with SessionLocal() as session:
+        jobs_added = len(ingest_jobs(session, jobs, logger))
 
-    logger.info(f"Inserted {jobs_added} jobs into the database.")
     end_time_scraping = time.time()
+    PIPELINE_STAGE_SECONDS.labels("total").observe(
+        end_time_scraping - start_time_scraping
+    )
     logger.info(
-        f"Total execution time: {end_time_scraping - start_time_scraping:.2f} seconds"
+        "Total execution time: %.2f seconds", end_time_scraping - start_time_scraping
     )
-    remove_null_entries(logger, env="prod" if args.prod else "dev")
-
-    if jobs_added > 0:
-        try:
-            response = requests.post(WEBHOOK_URL)
-        except Exception as e:
-            logger.error(f"Failed to send webhook notification: {e}")
-
-        if response.status_code == 200:
-            logger.info("Job notification triggered successfully")
-        else:
-            logger.error(f"Failed to trigger notification: {response.status_code}")
-    else:
-        logger.info("No new jobs added, skipping webhook notification")
+    # Delivery also picks up notifications left over from failed runs, so it
+    # runs even when nothing new was added
+    if jobs_added == 0:
+        logger.info("No new jobs added, sending pending webhook notifications only")
+    delivery = start_delivery(SessionLocal, logger)
+
+    if args.cleanup_nulls:
+        remove_null_entries(logger, SessionLocal)
+    if args.archive:
+        archive_expired_jobs(logger, SessionLocal)
+
+    delivery.join()
+    export_batch_metrics(logger)
 
 
 if __name__ == "__main__":
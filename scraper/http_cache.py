@@ -0,0 +1,184 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import requests
+
+
+class CachedResponse:
+    def __init__(self, status_code, content, headers=None, encoding=None, from_cache=False):
+        self.status_code = status_code
+        self.content = content
+        self.headers = headers or {}
+        self.encoding = encoding
+        self.from_cache = from_cache
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or "utf-8", errors="replace")
+
+
+class HttpCache:
+    """
+    On-disk HTTP cache for job pages.
+
+    Bodies are stored as files under ``directory`` and the validators
+    (ETag / Last-Modified) live in a small SQLite index next to them. When an
+    entry exists, requests are sent with ``If-None-Match`` / ``If-Modified-Since``
+    and a 304 is answered from disk. The least recently used entries are
+    evicted once the stored bodies exceed ``max_bytes``.
+    """
+
+    def __init__(self, directory="data/http_cache", max_bytes=256 * 1024 * 1024):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(
+            self.directory / "index.sqlite", check_same_thread=False
+        )
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS entries (
+                url TEXT PRIMARY KEY,
+                filename TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                encoding TEXT,
+                size INTEGER NOT NULL,
+                last_access REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute(
+            "CREATE INDEX IF NOT EXISTS ix_entries_last_access ON entries (last_access)"
+        )
+        self._conn.commit()
+        self.total_bytes = self._conn.execute(
+            "SELECT COALESCE(SUM(size), 0) FROM entries"
+        ).fetchone()[0]
+
+    def _lookup(self, url):
+        return self._conn.execute(
+            "SELECT filename, etag, last_modified, encoding FROM entries WHERE url = ?",
+            (url,),
+        ).fetchone()
+
+    def _read_body(self, filename):
+        try:
+            return (self.directory / filename).read_bytes()
+        except FileNotFoundError:
+            return None
+
+    def _touch(self, url):
+        self._conn.execute(
+            "UPDATE entries SET last_access = ? WHERE url = ?", (time.time(), url)
+        )
+        self._conn.commit()
+
+    def _forget(self, url):
+        row = self._conn.execute(
+            "SELECT filename, size FROM entries WHERE url = ?", (url,)
+        ).fetchone()
+        if row:
+            (self.directory / row[0]).unlink(missing_ok=True)
+            self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+            self.total_bytes -= row[1]
+            self._conn.commit()
+
+    def _store(self, url, response):
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if not etag and not last_modified:
+            return
+
+        filename = hashlib.sha256(url.encode("utf-8")).hexdigest()
+        body = response.content
+        (self.directory / filename).write_bytes(body)
+
+        previous = self._conn.execute(
+            "SELECT size FROM entries WHERE url = ?", (url,)
+        ).fetchone()
+        if previous:
+            self.total_bytes -= previous[0]
+        self._conn.execute(
+            """
+            INSERT OR REPLACE INTO entries
+                (url, filename, etag, last_modified, encoding, size, last_access)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+            """,
+            (url, filename, etag, last_modified, response.encoding, len(body), time.time()),
+        )
+        self.total_bytes += len(body)
+        self._evict()
+        self._conn.commit()
+
+    def _evict(self):
+        while self.total_bytes > self.max_bytes:
+            rows = self._conn.execute(
+                "SELECT url, filename, size FROM entries ORDER BY last_access LIMIT 64"
+            ).fetchall()
+            if not rows:
+                self.total_bytes = 0
+                return
+            for url, filename, size in rows:
+                (self.directory / filename).unlink(missing_ok=True)
+                self._conn.execute("DELETE FROM entries WHERE url = ?", (url,))
+                self.total_bytes -= size
+                if self.total_bytes <= self.max_bytes:
+                    break
+
+    def get(self, url, headers=None, timeout=30, fetch=None) -> CachedResponse:
+        fetch = fetch or requests.get
+        headers = dict(headers or {})
+        with self._lock:
+            entry = self._lookup(url)
+        if entry:
+            _, etag, last_modified, _ = entry
+            if etag:
+                headers["If-None-Match"] = etag
+            if last_modified:
+                headers["If-Modified-Since"] = last_modified
+
+        response = fetch(url, headers=headers, timeout=timeout)
+
+        with self._lock:
+            if response.status_code == 304 and entry:
+                filename, _, _, encoding = entry
+                body = self._read_body(filename)
+                if body is not None:
+                    self._touch(url)
+                    return CachedResponse(
+                        200, body, response.headers, encoding, from_cache=True
+                    )
+                # The body vanished from disk, drop the stale entry
+                self._forget(url)
+            elif response.status_code == 200:
+                self._store(url, response)
+
+        if response.status_code == 304:
+            # Fall back to a full download and cache it again
+            headers.pop("If-None-Match", None)
+            headers.pop("If-Modified-Since", None)
+            response = fetch(url, headers=headers, timeout=timeout)
+            if response.status_code == 200:
+                with self._lock:
+                    self._store(url, response)
+
+        return CachedResponse(
+            response.status_code, response.content, response.headers, response.encoding
+        )
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+
+def init_http_cache() -> HttpCache:
+    load_dotenv()
+    directory = os.getenv("HTTP_CACHE_DIR", "data/http_cache")
+    max_mb = int(os.getenv("HTTP_CACHE_MAX_MB", 256))
+    return HttpCache(directory, max_bytes=max_mb * 1024 * 1024)
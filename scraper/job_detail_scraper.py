@@ -1,48 +1,89 @@
 from datetime import datetime
-import requests
+from functools import partial
 from bs4 import BeautifulSoup
 import config.urls
 from db.models.Job import Job
 import parser.parsers as parsers
-import random
-from config.user_agents import user_agents
+from scraper.http_cache import HttpCache
+from services.egress.egress import EgressUnavailable, get_egress_manager
+from utils.fingerprint import job_fingerprint
+import time
+from services.metrics.metrics import PARSE_SECONDS, observe_fetch
 
 
-def scrape_job_detail(job_id, index, logger) -> Job:
-    logger.info(f"Job {index}: Scraping job detail for Job ID: {job_id}")
-    headers = {
-        "User-Agent": random.choice(user_agents),
-    }
+def fetch_job_page(job_id, logger, cache: HttpCache = None, before_retry=None):
+    fetch = partial(get_egress_manager().get, before_retry=before_retry)
     url = config.urls.BASE_JOB_DETAIL_URL + str(job_id)
 
+    started = time.perf_counter()
     try:
-        response = requests.get(url, headers=headers, timeout=30)
+        if cache is not None:
+            response = cache.get(url, timeout=30, fetch=fetch)
+        else:
+            response = fetch(url, timeout=30)
+    except EgressUnavailable:
+        # Stops the caller's loop, retrying would fail the same way
+        raise
     except Exception as e:
-        logger.error(f"Request failed for Job ID {job_id}: {e}")
+        observe_fetch("detail", started, None)
+        logger.error("Request failed for Job ID %s: %s", job_id, e)
+        return url, None
+
+    observe_fetch("detail", started, response)
+    return url, response
+
+
+@PARSE_SECONDS.labels("detail").time()
+def parse_job_detail(job_id, url, response) -> Job:
+    soup = BeautifulSoup(response.content, "html.parser")
+    title = parsers.get_title(soup)
+    work_type = parsers.get_work_type(soup)
+    salary = parsers.get_salary(soup)
+    hours_per_week = parsers.get_hours_per_week(soup)
+    job_overview = parsers.get_job_overview(soup)
+    now = datetime.now().isoformat()
+
+    job = Job(
+        job_id=job_id,
+        title=title,
+        work_type=work_type,
+        salary=salary,
+        hours_per_week=hours_per_week,
+        job_overview=job_overview,
+        raw_text=response.text,
+        link=url,
+        date_created=now,
+        last_checked=now,
+    )
+    job.fingerprint = job_fingerprint(job)
+    return job
+
+
+def scrape_job_detail(
+    job_id, index, logger, cache: HttpCache = None, before_retry=None
+) -> Job:
+    logger.info(
+        "Job %s: Scraping job detail for Job ID: %s",
+        index,
+        job_id,
+        extra={"sampled": True},
+    )
+    url, response = fetch_job_page(job_id, logger, cache, before_retry)
+    if response is None:
         return None
 
     if response.status_code == 200:
-        soup = BeautifulSoup(response.content, "html.parser")
-        title = parsers.get_title(soup)
-        work_type = parsers.get_work_type(soup)
-        salary = parsers.get_salary(soup)
-        hours_per_week = parsers.get_hours_per_week(soup)
-        job_overview = parsers.get_job_overview(soup)
-
-        job = Job(
-            job_id=job_id,
-            title=title,
-            work_type=work_type,
-            salary=salary,
-            hours_per_week=hours_per_week,
-            job_overview=job_overview,
-            raw_text=response.text,
-            link=url,
-            date_created=datetime.now().isoformat(),
-        )
-        return job
+        if getattr(response, "from_cache", False):
+            logger.info(
+                "Job ID %s not modified, using cached page",
+                job_id,
+                extra={"sampled": True},
+            )
+        return parse_job_detail(job_id, url, response)
     else:
         logger.error(
-            f"Failed to retrieve job details for Job ID {job_id}. Status code: {response.status_code}"
+            "Failed to retrieve job details for Job ID %s. Status code: %s",
+            job_id,
+            response.status_code,
         )
         return None
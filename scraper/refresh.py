@@ -0,0 +1,121 @@
+from datetime import datetime, timedelta
+from typing import List
+from sqlalchemy import or_
+from config.refresh import (
+    REFRESH_CLOSED_STATUS_CODES,
+    REFRESH_TIERS,
+)
+from db.models.Job import Job
+from scraper.http_cache import HttpCache
+from scraper.job_detail_scraper import fetch_job_page, parse_job_detail
+from services.egress.egress import EgressUnavailable
+from utils.fingerprint import FINGERPRINT_FIELDS, job_fingerprint
+
+
+def select_jobs_for_refresh(session, limit, now: datetime = None) -> List[Job]:
+    now = now or datetime.now()
+    selected: List[Job] = []
+    newer_than = None
+
+    for max_age_days, interval_days in REFRESH_TIERS:
+        remaining = limit - len(selected)
+        if remaining <= 0:
+            break
+
+        due_before = (now - timedelta(days=interval_days)).isoformat()
+        query = session.query(Job).filter(
+            Job.date_closed.is_(None),
+            or_(Job.last_checked.is_(None), Job.last_checked < due_before),
+        )
+        if max_age_days is not None:
+            older_than = (now - timedelta(days=max_age_days)).isoformat()
+            query = query.filter(Job.date_created >= older_than)
+        if newer_than is not None:
+            query = query.filter(Job.date_created < newer_than)
+
+        selected.extend(
+            query.order_by(Job.last_checked.is_not(None), Job.last_checked)
+            .limit(remaining)
+            .all()
+        )
+        if max_age_days is not None:
+            newer_than = older_than
+
+    return selected
+
+
+def refresh_jobs(session, logger, limit, cache: HttpCache = None) -> List[Job]:
+    """
+    Re-fetch stored jobs that are due for a check and write back only the
+    ones whose content fingerprint changed. Postings that return 404/410 are
+    marked closed. Returns the changed jobs; their new fingerprint is left
+    for the caller to store together with the new summary, so a job whose
+    summary was never regenerated is found changed again next time.
+    """
+    jobs = select_jobs_for_refresh(session, limit)
+    logger.info("Selected %s jobs for refresh", len(jobs))
+
+    changed: List[Job] = []
+    unchanged_ids = []
+    closed = 0
+
+    for index, job in enumerate(jobs, start=1):
+        logger.info(
+            "Job %s: Refreshing Job ID: %s", index, job.job_id, extra={"sampled": True}
+        )
+        try:
+            url, response = fetch_job_page(job.job_id, logger, cache)
+        except EgressUnavailable as e:
+            logger.error("%s, stopping the refresh", e)
+            break
+        if response is None:
+            continue
+        now = datetime.now().isoformat()
+
+        if response.status_code in REFRESH_CLOSED_STATUS_CODES:
+            logger.info("Job ID %s was removed, marking as closed", job.job_id)
+            job.date_closed = now
+            job.last_checked = now
+            closed += 1
+            continue
+
+        if response.status_code != 200:
+            logger.error(
+                "Failed to refresh Job ID %s. Status code: %s",
+                job.job_id,
+                response.status_code,
+            )
+            continue
+
+        if getattr(response, "from_cache", False) and job.fingerprint:
+            unchanged_ids.append(job.id)
+            continue
+
+        fresh = parse_job_detail(job.job_id, url, response)
+        if fresh.fingerprint == (job.fingerprint or job_fingerprint(job)):
+            if job.fingerprint is None:
+                job.fingerprint = fresh.fingerprint
+            unchanged_ids.append(job.id)
+            continue
+
+        logger.info("Job ID %s changed, updating", job.job_id)
+        for field in FINGERPRINT_FIELDS:
+            setattr(job, field, getattr(fresh, field))
+        job.raw_text = fresh.raw_text
+        job.date_updated = now
+        job.last_checked = now
+        changed.append(job)
+
+    now = datetime.now().isoformat()
+    for start in range(0, len(unchanged_ids), 500):
+        session.query(Job).filter(Job.id.in_(unchanged_ids[start : start + 500])).update(
+            {Job.last_checked: now}, synchronize_session=False
+        )
+
+    logger.info(
+        "Refresh finished: %s changed, %s closed, %s unchanged",
+        len(changed),
+        closed,
+        len(unchanged_ids),
+    )
+    return changed
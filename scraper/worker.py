@@ -0,0 +1,144 @@
+import os
+import socket
+import time
+import uuid
+from typing import List
+from sqlalchemy.exc import SQLAlchemyError
+from urllib.parse import urlparse
+import config.urls
+from config.distributed import (
+    POLITENESS_INTERVAL_SECONDS,
+    QUEUE_CLAIM_BATCH_SIZE,
+    QUEUE_LEASE_SECONDS,
+    QUEUE_MAX_ATTEMPTS,
+    QUEUE_POLL_SECONDS,
+)
+from db.models.Job import Job
+from db.repository import queue_repository
+from scraper.http_cache import HttpCache
+from scraper.job_detail_scraper import scrape_job_detail
+from services.egress.egress import EgressUnavailable
+from services.ingest.pipeline import ingest_jobs
+from services.notifier.webhook import deliver_pending
+
+
+def default_worker_id() -> str:
+    return f"{socket.gethostname()}-{os.getpid()}"
+
+
+def run_worker(
+    SessionLocal,
+    logger,
+    worker_id=None,
+    cache: HttpCache = None,
+    exit_when_idle=False,
+) -> int:
+    """
+    Claim leased batches from the shared scrape queue, fetch and parse them,
+    and persist them through the normal ingest pipeline until the queue is
+    empty (``exit_when_idle``) or forever. Returns the number of jobs inserted.
+    """
+    worker_id = worker_id or default_worker_id()
+    host = urlparse(config.urls.BASE_JOB_DETAIL_URL).netloc
+    inserted = 0
+    processed = 0
+
+    logger.info("Worker %s started", worker_id)
+    with SessionLocal() as session:
+
+        def wait_for_host_slot():
+            time.sleep(
+                queue_repository.reserve_host_slot(
+                    session, host, POLITENESS_INTERVAL_SECONDS
+                )
+            )
+
+        while True:
+            lease_owner = f"{worker_id}:{uuid.uuid4().hex[:8]}"
+            try:
+                tasks = queue_repository.claim_tasks(
+                    session,
+                    lease_owner,
+                    QUEUE_CLAIM_BATCH_SIZE,
+                    QUEUE_LEASE_SECONDS,
+                    QUEUE_MAX_ATTEMPTS,
+                )
+                if not tasks:
+                    queue_repository.fail_exhausted_tasks(session, QUEUE_MAX_ATTEMPTS)
+                    if exit_when_idle:
+                        break
+                    logger.info("Queue empty, waiting %ss", QUEUE_POLL_SECONDS)
+                    time.sleep(QUEUE_POLL_SECONDS)
+                    continue
+
+                jobs: List[Job] = []
+                fetched = []
+                cooldown = None
+                for task in tasks:
+                    wait_for_host_slot()
+                    processed += 1
+                    try:
+                        # A throttled request is retried in a new slot too
+                        job = scrape_job_detail(
+                            task.job_id, processed, logger, cache, wait_for_host_slot
+                        )
+                    except EgressUnavailable as e:
+                        cooldown = e.wait
+                        break
+                    if job is None:
+                        if task.attempts >= QUEUE_MAX_ATTEMPTS:
+                            queue_repository.finish_task(
+                                session, task, "failed", "Failed to fetch job detail"
+                            )
+                        else:
+                            queue_repository.release_task(
+                                session, task, "Failed to fetch job detail"
+                            )
+                        continue
+                    jobs.append(job)
+                    fetched.append(task)
+
+                batch_inserted = len(ingest_jobs(session, jobs, logger))
+                # Only marked done once their jobs are stored. If the worker dies
+                # before this, the tasks are claimed again after the lease and
+                # ingest skips the jobs that were stored.
+                for task in fetched:
+                    queue_repository.finish_task(session, task, "done")
+                session.commit()
+                inserted += batch_inserted
+                if batch_inserted:
+                    deliver_pending(SessionLocal, logger)
+
+                if cooldown is not None:
+                    # The rest of the batch goes back on the queue, e.g. for
+                    # workers on other hosts
+                    queue_repository.release_lease(
+                        session, lease_owner, "All egress identities cooling down"
+                    )
+                    logger.warning(
+                        "All egress identities are cooling down, worker %s pauses for %.0fs",
+                        worker_id,
+                        cooldown,
+                    )
+                    time.sleep(cooldown)
+            except SQLAlchemyError as e:
+                # E.g. "database is locked", or a job another process stored
+                # first; the batch goes back on the queue instead of waiting
+                # for its lease to expire
+                logger.error(
+                    "Database error in worker %s, releasing batch: %s", worker_id, e
+                )
+                session.rollback()
+                try:
+                    queue_repository.release_lease(session, lease_owner, str(e))
+                except SQLAlchemyError as release_error:
+                    session.rollback()
+                    logger.error(
+                        "Failed to release batch %s: %s", lease_owner, release_error
+                    )
+                time.sleep(QUEUE_POLL_SECONDS)
+
+    logger.info(
+        "Worker %s finished: %s tasks, %s jobs inserted", worker_id, processed, inserted
+    )
+    return inserted
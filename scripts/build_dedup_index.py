@@ -0,0 +1,38 @@
+from db.engine.registry import get_session_factory, resolve_env
+from db.repository import dedup_repository
+from services.dedup.near_duplicates import index_job
+from utils.args_init import init_cli_args
+
+# Need to import all models here because otherwise they won't be registered in Base
+from db.models.Job import Job
+from db.models.JobSignature import JobSignature
+from db.models.LshBucket import LshBucket
+
+BATCH_SIZE = 500
+
+
+def main():
+    args = init_cli_args()
+    print("Building near-duplicate index for stored jobs...")
+    env = resolve_env(args)
+    print(f"Using {'remote' if env == 'prod' else 'local'} database")
+    SessionLocal = get_session_factory(env)
+
+    indexed = 0
+    last_id = 0
+    with SessionLocal() as session:
+        while True:
+            jobs = dedup_repository.get_unindexed_jobs(session, last_id, BATCH_SIZE)
+            if not jobs:
+                break
+            for job in jobs:
+                if index_job(session, job):
+                    indexed += 1
+            last_id = jobs[-1].id
+            session.commit()
+            print(f"Indexed {indexed} jobs so far")
+    print(f"Near-duplicate index built for {indexed} jobs.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,31 @@
+from db.engine.registry import get_session_factory, resolve_env
+from services.export.parquet import export_jobs
+from utils.args_init import init_cli_args
+
+# Need to import all models here because otherwise they won't be registered in Base
+from db.models.Job import Job
+from db.models.JobChange import JobChange
+
+
+def main():
+    args = init_cli_args()
+    print(f"Exporting jobs to {args.export_dir}...")
+    env = resolve_env(args)
+    print(f"Using {'remote' if env == 'prod' else 'local'} database")
+    SessionLocal = get_session_factory(env)
+
+    with SessionLocal() as session:
+        result = export_jobs(
+            session,
+            args.export_dir,
+            full=args.full_export,
+            include_raw_text=not args.skip_raw_text,
+        )
+    print(
+        f"{result['mode'].capitalize()} export finished: {result['rows']} jobs "
+        f"in {result['partitions']} partitions (change feed position {result['seq']})."
+    )
+
+
+if __name__ == "__main__":
+    main()
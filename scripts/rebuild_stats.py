@@ -0,0 +1,24 @@
+from db.engine.registry import get_session_factory, resolve_env
+from db.repository import stats_repository
+from utils.args_init import init_cli_args
+
+# Need to import all models here because otherwise they won't be registered in Base
+from db.models.Job import Job
+from db.models.JobStatDaily import JobStatDaily
+
+
+def main():
+    args = init_cli_args()
+    print("Rebuilding job statistics from stored jobs...")
+    env = resolve_env(args)
+    print(f"Using {'remote' if env == 'prod' else 'local'} database")
+    SessionLocal = get_session_factory(env)
+
+    with SessionLocal() as session:
+        buckets = stats_repository.rebuild(session)
+        session.commit()
+    print(f"Job statistics rebuilt into {buckets} buckets.")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,16 @@
+from db.engine.registry import get_session_factory, resolve_env
+from services.logger.logger_config import Logger
+from utils.args_init import init_cli_args
+from utils.remove_nulls import remove_null_entries
+
+
+def main():
+    args = init_cli_args()
+    logger = Logger("main").get()
+    env = resolve_env(args)
+    logger.info("Using %s database", "remote" if env == "prod" else "local")
+    remove_null_entries(logger, get_session_factory(env))
+
+
+if __name__ == "__main__":
+    main()
@@ -1,22 +1,28 @@
-from db.engine.engine import engine_init_local, engine_init_remote
+from db.engine.registry import get_engine, resolve_env
 from db.models.Base import Base
 from utils.args_init import init_cli_args
 
 # Need to import all models here because otherwise they won't be registered in Base
 from db.models.Job import Job
+from db.models.JobSignature import JobSignature
+from db.models.LshBucket import LshBucket
+from db.models.ScrapeTask import ScrapeTask
+from db.models.HostRateLimit import HostRateLimit
+from db.models.QuarantinedJob import QuarantinedJob
+from db.models.WebhookOutbox import WebhookOutbox
+from db.models.JobChange import JobChange
+from db.models.JobStatDaily import JobStatDaily
+from db.models.Subscription import Subscription
+from db.models.ArchivedJob import ArchivedJob
 
 
 def main():
     args = init_cli_args()
     print("Cleaning/Removing database tables...")
-    if args.prod:
-        print("Using remote database")
-        engine = engine_init_remote()
-        Base.metadata.drop_all(bind=engine)
-    else:
-        print("Using local database")
-        engine = engine_init_local()
-        Base.metadata.drop_all(bind=engine)
+    env = resolve_env(args)
+    print(f"Using {'remote' if env == 'prod' else 'local'} database")
+    engine = get_engine(env)
+    Base.metadata.drop_all(bind=engine)
     print("Database tables removed successfully.")
 
 
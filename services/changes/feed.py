@@ -0,0 +1,47 @@
+import asyncio
+import threading
+import time
+from starlette.concurrency import run_in_threadpool
+from config.changes import CHANGE_FEED_POLL_SECONDS
+from db.repository import change_repository
+
+
+class ChangeFeed:
+    """
+    Cached view of the newest job_changes sequence number.
+
+    Waiting consumers all share one cached value, which is re-read from the
+    database at most once per ``poll_seconds``. However many clients
+    long-poll or stream, an idle API process only runs one cheap
+    ``MAX(seq)`` lookup per interval.
+    """
+
+    def __init__(self, session_factory, poll_seconds=CHANGE_FEED_POLL_SECONDS):
+        self.session_factory = session_factory
+        self.poll_seconds = poll_seconds
+        self.head = None
+        self.checked_at = 0.0
+        self._lock = threading.Lock()
+
+    def latest_seq(self, fresh=False) -> int:
+        stale = time.monotonic() - self.checked_at >= self.poll_seconds
+        if self.head is None or fresh or stale:
+            # Callers arriving while a refresh is running use the cached value
+            if self._lock.acquire(blocking=self.head is None or fresh):
+                try:
+                    with self.session_factory() as session:
+                        self.head = change_repository.get_latest_seq(session)
+                    self.checked_at = time.monotonic()
+                finally:
+                    self._lock.release()
+        return self.head
+
+    async def wait_for(self, since, timeout) -> int:
+        """Return the latest seq once it passes ``since`` or ``timeout`` runs out."""
+        deadline = time.monotonic() + timeout
+        while True:
+            head = await run_in_threadpool(self.latest_seq)
+            remaining = deadline - time.monotonic()
+            if head > since or remaining <= 0:
+                return head
+            await asyncio.sleep(min(self.poll_seconds, remaining))
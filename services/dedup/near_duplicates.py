@@ -0,0 +1,88 @@
+from typing import List
+from config.dedup import DEDUP_THRESHOLD
+from db.models.Job import Job
+from db.repository import dedup_repository, job_repository
+from utils.minhash import (
+    estimate_similarity,
+    lsh_buckets,
+    minhash_signature,
+    pack_signature,
+    unpack_signature,
+)
+
+
+def find_near_duplicate(session, signature, batch=()) -> Job | None:
+    buckets = lsh_buckets(signature)
+    matches = []
+    for job_id, packed in dedup_repository.get_candidates(session, buckets):
+        similarity = estimate_similarity(signature, unpack_signature(packed))
+        if similarity >= DEDUP_THRESHOLD:
+            matches.append((similarity, job_id, None))
+
+    # The original may be part of the current batch and not stored yet
+    for job, other_signature, other_buckets in batch:
+        if set(buckets).isdisjoint(other_buckets):
+            continue
+        similarity = estimate_similarity(signature, other_signature)
+        if similarity >= DEDUP_THRESHOLD:
+            matches.append((similarity, job.job_id, job))
+
+    for _, job_id, job in sorted(matches, key=lambda match: match[0], reverse=True):
+        job = job or job_repository.get_job_by_job_id(session, job_id)
+        if job is not None:
+            return job
+    return None
+
+
+def index_job(session, job: Job) -> bool:
+    signature = minhash_signature(job.job_overview or "")
+    if signature is None:
+        return False
+    dedup_repository.add_signature(
+        session, job.job_id, pack_signature(signature), lsh_buckets(signature)
+    )
+    return True
+
+
+def link_near_duplicates(session, jobs: List[Job], logger):
+    """
+    Point reposted ads at the posting they copy. Jobs whose job_overview is
+    nearly identical to an already indexed job get ``duplicate_of`` and that
+    job's summary. Nothing is written: returns the jobs that still need a
+    summary, and the signatures to add to the index with
+    ``store_signatures`` once the jobs are inserted.
+    """
+    to_summarize: List[Job] = []
+    batch = []
+
+    for job in jobs:
+        signature = minhash_signature(job.job_overview or "")
+        if signature is None:
+            to_summarize.append(job)
+            continue
+
+        original = find_near_duplicate(session, signature, batch)
+        if original is None:
+            batch.append((job, signature, lsh_buckets(signature)))
+            to_summarize.append(job)
+            continue
+
+        logger.info("Job %s is a near-duplicate of %s", job.job_id, original.job_id)
+        job.duplicate_of = original.job_id
+        job.summary = original.summary
+
+    return to_summarize, batch
+
+
+def store_signatures(session, batch):
+    for job, signature, buckets in batch:
+        dedup_repository.add_signature(
+            session, job.job_id, pack_signature(signature), buckets
+        )
+
+
+def copy_duplicate_summaries(jobs: List[Job]):
+    by_job_id = {job.job_id: job for job in jobs}
+    for job in jobs:
+        if job.duplicate_of in by_job_id and job.summary is None:
+            job.summary = by_job_id[job.duplicate_of].summary
@@ -0,0 +1,204 @@
+import os
+import random
+import threading
+import time
+from pathlib import Path
+from dotenv import load_dotenv
+import requests
+from config.egress import (
+    EGRESS_BAN_STATUS_CODES,
+    EGRESS_COOLDOWN_SECONDS,
+    EGRESS_INITIAL_RATE,
+    EGRESS_MAX_COOLDOWN_SECONDS,
+    EGRESS_MAX_RATE,
+    EGRESS_MAX_WAIT_SECONDS,
+    EGRESS_MIN_RATE,
+    EGRESS_RATE_DECREASE,
+    EGRESS_RATE_INCREASE,
+    EGRESS_SLOW_RESPONSE_DECREASE,
+    EGRESS_SLOW_RESPONSE_FACTOR,
+    EGRESS_THROTTLE_STATUS_CODES,
+)
+from config.user_agents import user_agents
+from services.metrics.metrics import EGRESS_COOLDOWNS, EGRESS_IDENTITY_RATE
+
+
+class EgressUnavailable(Exception):
+    """Every identity is cooling down for longer than EGRESS_MAX_WAIT_SECONDS."""
+
+    def __init__(self, wait):
+        super().__init__(f"All egress identities are cooling down for {wait:.0f}s")
+        self.wait = wait
+
+
+class Identity:
+    def __init__(self, name, proxy, user_agent):
+        self.name = name
+        self.proxy = proxy
+        self.user_agent = user_agent
+        self.rate = EGRESS_INITIAL_RATE
+        self.health = 1.0
+        self.latency = None
+        self.next_allowed_at = 0.0
+        self.cooldown_until = 0.0
+        self.consecutive_bans = 0
+
+    @property
+    def proxies(self):
+        if not self.proxy:
+            return None
+        return {"http": self.proxy, "https": self.proxy}
+
+    def available_at(self) -> float:
+        return max(self.next_allowed_at, self.cooldown_until)
+
+    def __repr__(self):
+        return f"Identity(name={self.name!r}, rate={self.rate:.3f}, health={self.health:.2f})"
+
+
+class EgressManager:
+    """
+    Pool of egress identities (proxy + sticky user agent) with adaptive rate
+    control. Each identity has its own request rate that grows additively
+    while the site answers normally and is cut multiplicatively on 429/503 or
+    a latency spike (AIMD). Identities answered with 403 are cooled down.
+    """
+
+    def __init__(self, proxies=None, agents=None):
+        agents = list(agents or user_agents)
+        random.shuffle(agents)
+        proxies = list(proxies or []) or [None]
+        self.identities = [
+            Identity(proxy or "direct", proxy, agents[index % len(agents)])
+            for index, proxy in enumerate(proxies)
+        ]
+        self._lock = threading.Lock()
+
+    def acquire(self) -> Identity:
+        with self._lock:
+            identity = min(
+                self.identities,
+                key=lambda item: (item.available_at(), -item.health),
+            )
+            now = time.monotonic()
+            start = max(now, identity.available_at())
+            if start - now > EGRESS_MAX_WAIT_SECONDS:
+                raise EgressUnavailable(start - now)
+            identity.next_allowed_at = start + 1.0 / identity.rate
+        wait = start - now
+        if wait > 0:
+            time.sleep(wait)
+        return identity
+
+    def report(self, identity: Identity, status_code, latency, retry_after=None):
+        with self._lock:
+            if status_code is None:
+                self._slow_down(identity, EGRESS_RATE_DECREASE)
+                identity.health = 0.8 * identity.health
+            elif status_code in EGRESS_BAN_STATUS_CODES:
+                identity.consecutive_bans += 1
+                cooldown = min(
+                    EGRESS_COOLDOWN_SECONDS * 2 ** (identity.consecutive_bans - 1),
+                    EGRESS_MAX_COOLDOWN_SECONDS,
+                )
+                identity.cooldown_until = time.monotonic() + cooldown
+                identity.rate = max(EGRESS_MIN_RATE, identity.rate * EGRESS_RATE_DECREASE)
+                identity.health = 0.5 * identity.health
+                EGRESS_COOLDOWNS.labels(identity.name).inc()
+            elif status_code in EGRESS_THROTTLE_STATUS_CODES:
+                self._slow_down(identity, EGRESS_RATE_DECREASE)
+                identity.health = 0.8 * identity.health
+                if retry_after:
+                    identity.cooldown_until = max(
+                        identity.cooldown_until, time.monotonic() + retry_after
+                    )
+            else:
+                identity.consecutive_bans = 0
+                identity.health = 0.9 * identity.health + 0.1
+                if (
+                    identity.latency is not None
+                    and latency > identity.latency * EGRESS_SLOW_RESPONSE_FACTOR
+                ):
+                    self._slow_down(identity, EGRESS_SLOW_RESPONSE_DECREASE)
+                else:
+                    identity.rate = min(
+                        EGRESS_MAX_RATE, identity.rate + EGRESS_RATE_INCREASE
+                    )
+
+            if status_code is not None:
+                identity.latency = (
+                    latency
+                    if identity.latency is None
+                    else 0.8 * identity.latency + 0.2 * latency
+                )
+            EGRESS_IDENTITY_RATE.labels(identity.name).set(identity.rate)
+
+    def _slow_down(self, identity: Identity, factor):
+        identity.rate = max(EGRESS_MIN_RATE, identity.rate * factor)
+        identity.next_allowed_at = time.monotonic() + 1.0 / identity.rate
+
+    def get(self, url, headers=None, timeout=30, before_retry=None):
+        # A throttled request is sent once more, after the back-off (and
+        # Retry-After) that report() applied. ``before_retry`` lets the caller
+        # wait for its own pacing first, e.g. the shared per-host slot of
+        # distributed workers.
+        for attempt in range(2):
+            if attempt and before_retry is not None:
+                before_retry()
+            identity = self.acquire()
+            headers = dict(headers or {})
+            headers["User-Agent"] = identity.user_agent
+            started = time.monotonic()
+            try:
+                response = requests.get(
+                    url, headers=headers, timeout=timeout, proxies=identity.proxies
+                )
+            except Exception:
+                self.report(identity, None, time.monotonic() - started)
+                raise
+
+            self.report(
+                identity,
+                response.status_code,
+                time.monotonic() - started,
+                _retry_after(response),
+            )
+            if attempt or response.status_code not in EGRESS_THROTTLE_STATUS_CODES:
+                return response
+
+
+def _retry_after(response):
+    value = response.headers.get("Retry-After")
+    try:
+        return float(value) if value else None
+    except ValueError:
+        return None
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def load_proxies():
+    load_dotenv()
+    proxies = [
+        proxy.strip()
+        for proxy in os.getenv("EGRESS_PROXIES", "").split(",")
+        if proxy.strip()
+    ]
+    proxy_file = os.getenv("EGRESS_PROXY_FILE")
+    if proxy_file and Path(proxy_file).exists():
+        proxies.extend(
+            line.strip()
+            for line in Path(proxy_file).read_text().splitlines()
+            if line.strip() and not line.startswith("#")
+        )
+    return proxies
+
+
+def get_egress_manager() -> EgressManager:
+    global _manager
+    with _manager_lock:
+        if _manager is None:
+            _manager = EgressManager(load_proxies())
+        return _manager
@@ -0,0 +1,253 @@
+import json
+import os
+import shutil
+from datetime import datetime
+import pyarrow as pa
+import pyarrow.parquet as pq
+from sqlalchemy import Integer, or_, select, union_all
+from config.changes import CHANGE_FEED_IGNORED_COLUMNS
+from config.export import (
+    EXPORT_BATCH_SIZE,
+    EXPORT_COMPRESSION,
+    EXPORT_UNKNOWN_PARTITION,
+)
+from db.models.ArchivedJob import ArchivedJob
+from db.models.Job import Job
+from db.repository import change_repository
+
+STATE_FILE = "_export_state.json"
+JOBS_DATASET = "jobs"
+RAW_TEXT_DATASET = "raw_text"
+PARTITION_FILE = "part-0.parquet"
+
+# raw_text is most of a row's size and goes to its own dataset. The columns
+# the change feed ignores are left out, because a partition is only
+# rewritten when the change feed reports a change in it.
+JOB_COLUMNS = [
+    column
+    for column in Job.__table__.columns
+    if column.key != "raw_text" and column.key not in CHANGE_FEED_IGNORED_COLUMNS
+]
+RAW_TEXT_COLUMNS = [Job.__table__.c.id, Job.__table__.c.job_id, Job.__table__.c.raw_text]
+
+
+def arrow_schema(columns) -> pa.Schema:
+    return pa.schema(
+        pa.field(column.key, pa.int64() if isinstance(column.type, Integer) else pa.string())
+        for column in columns
+    )
+
+
+JOB_SCHEMA = arrow_schema(JOB_COLUMNS)
+RAW_TEXT_SCHEMA = arrow_schema(RAW_TEXT_COLUMNS)
+
+
+def partition_key(date_created) -> str:
+    return date_created[:10] if date_created else EXPORT_UNKNOWN_PARTITION
+
+
+def partition_filter(model, key) -> tuple:
+    if key == EXPORT_UNKNOWN_PARTITION:
+        return (or_(model.date_created.is_(None), model.date_created == ""),)
+    # Prefix range, so the date_created index is used
+    upper = key[:-1] + chr(ord(key[-1]) + 1)
+    return model.date_created >= key, model.date_created < upper
+
+
+def partition_dir(out_dir, dataset, key) -> str:
+    return os.path.join(out_dir, dataset, f"date={key}")
+
+
+def remove_partition(out_dir, key):
+    for dataset in (JOBS_DATASET, RAW_TEXT_DATASET):
+        shutil.rmtree(partition_dir(out_dir, dataset, key), ignore_errors=True)
+
+
+class PartitionWriter:
+    """
+    Writes one partition of each dataset, a row group per batch. The files
+    are written next to the old ones and swapped in on close, so readers
+    never see a half-written partition.
+    """
+
+    def __init__(self, out_dir, key, include_raw_text):
+        targets = [(JOBS_DATASET, JOB_SCHEMA)]
+        if include_raw_text:
+            targets.append((RAW_TEXT_DATASET, RAW_TEXT_SCHEMA))
+        self.writers = []
+        for dataset, schema in targets:
+            directory = partition_dir(out_dir, dataset, key)
+            os.makedirs(directory, exist_ok=True)
+            path = os.path.join(directory, PARTITION_FILE)
+            writer = pq.ParquetWriter(f"{path}.tmp", schema, compression=EXPORT_COMPRESSION)
+            self.writers.append((writer, path, schema))
+        self.rows = 0
+
+    def write(self, rows):
+        for writer, _, schema in self.writers:
+            columns = {name: [row[name] for row in rows] for name in schema.names}
+            writer.write_table(pa.Table.from_pydict(columns, schema=schema))
+        self.rows += len(rows)
+
+    def close(self):
+        for writer, path, _ in self.writers:
+            writer.close()
+            os.replace(f"{path}.tmp", path)
+
+
+def stream_rows(session, key=None):
+    """Batches of rows from jobs and jobs_archive, the whole history or one
+    partition, ordered by date_created."""
+    names = list({column.key: None for column in JOB_COLUMNS + RAW_TEXT_COLUMNS})
+    selects = []
+    for model in (Job, ArchivedJob):
+        criteria = partition_filter(model, key) if key is not None else ()
+        selects.append(select(*[getattr(model, name) for name in names]).where(*criteria))
+    query = (
+        union_all(*selects)
+        .order_by("date_created", "id")
+        .execution_options(yield_per=EXPORT_BATCH_SIZE)
+    )
+    yield from session.execute(query).mappings().partitions(EXPORT_BATCH_SIZE)
+
+
+def export_all(session, out_dir, include_raw_text) -> tuple[int, int]:
+    """Rewrite every partition. Jobs arrive ordered by date, so only one
+    partition is open at a time and memory stays at one batch."""
+    written = set()
+    writer = None
+    key = None
+    rows_written = 0
+    for rows in stream_rows(session):
+        start = 0
+        for i, row in enumerate(rows):
+            row_key = partition_key(row["date_created"])
+            if row_key == key:
+                continue
+            if writer is not None:
+                writer.write(rows[start:i])
+                writer.close()
+            key = row_key
+            writer = PartitionWriter(out_dir, key, include_raw_text)
+            written.add(key)
+            start = i
+        writer.write(rows[start:])
+        rows_written += len(rows)
+    if writer is not None:
+        writer.close()
+
+    for dataset in (JOBS_DATASET, RAW_TEXT_DATASET):
+        root = os.path.join(out_dir, dataset)
+        if not os.path.isdir(root):
+            continue
+        if dataset == RAW_TEXT_DATASET and not include_raw_text:
+            shutil.rmtree(root)
+            continue
+        for name in os.listdir(root):
+            if name.startswith("date=") and name[len("date="):] not in written:
+                shutil.rmtree(os.path.join(root, name))
+    return len(written), rows_written
+
+
+def export_partition(session, out_dir, key, include_raw_text) -> int:
+    writer = None
+    for rows in stream_rows(session, key):
+        if writer is None:
+            writer = PartitionWriter(out_dir, key, include_raw_text)
+        writer.write(rows)
+    if writer is None:
+        remove_partition(out_dir, key)
+        return 0
+    writer.close()
+    return writer.rows
+
+
+def find_partitions(out_dir, job_ids) -> set:
+    """Partitions holding any of ``job_ids``, read from the job_id column
+    of the exported files."""
+    keys = set()
+    root = os.path.join(out_dir, JOBS_DATASET)
+    if not job_ids or not os.path.isdir(root):
+        return keys
+    for name in os.listdir(root):
+        path = os.path.join(root, name, PARTITION_FILE)
+        if not name.startswith("date=") or not os.path.exists(path):
+            continue
+        exported = pq.read_table(path, columns=["job_id"]).column("job_id").to_pylist()
+        if job_ids.intersection(exported):
+            keys.add(name[len("date="):])
+    return keys
+
+
+def changed_partitions(session, out_dir, since, until) -> set:
+    keys = set()
+    deleted = set()
+    for job_id, pk, date_created in change_repository.get_changed_jobs(
+        session, since, until
+    ):
+        if pk is None:
+            deleted.add(job_id)
+        else:
+            keys.add(partition_key(date_created))
+    return keys | find_partitions(out_dir, deleted)
+
+
+def load_state(out_dir) -> dict | None:
+    path = os.path.join(out_dir, STATE_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_state(out_dir, state: dict):
+    path = os.path.join(out_dir, STATE_FILE)
+    with open(f"{path}.tmp", "w") as f:
+        json.dump(state, f, indent=2)
+    os.replace(f"{path}.tmp", path)
+
+
+def export_jobs(session, out_dir, full=False, include_raw_text=True) -> dict:
+    """
+    Export the jobs table to date-partitioned Parquet files under
+    ``out_dir``. After the first run only the partitions touched by the
+    change feed since the previous export are rewritten.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    # Read before the jobs, so changes made during the export are picked
+    # up again by the next one
+    until = change_repository.get_latest_seq(session)
+    state = load_state(out_dir)
+    columns = [column.key for column in JOB_COLUMNS]
+    incremental = (
+        not full
+        and state is not None
+        and state.get("columns") == columns
+        and state.get("raw_text") == include_raw_text
+    )
+
+    if incremental:
+        keys = changed_partitions(session, out_dir, state["seq"], until)
+        rows = sum(
+            export_partition(session, out_dir, key, include_raw_text)
+            for key in sorted(keys)
+        )
+        partitions = len(keys)
+    else:
+        partitions, rows = export_all(session, out_dir, include_raw_text)
+
+    save_state(
+        out_dir,
+        {
+            "seq": until,
+            "exported_at": datetime.now().isoformat(),
+            "columns": columns,
+            "raw_text": include_raw_text,
+        },
+    )
+    return {
+        "mode": "incremental" if incremental else "full",
+        "partitions": partitions,
+        "rows": rows,
+        "seq": until,
+    }
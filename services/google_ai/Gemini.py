@@ -1,14 +1,24 @@
 from typing import List
-from google import genai
-from google.genai import types
 import os
 import asyncio
 from dotenv import load_dotenv
 from db.models.Job import Job
 from .models import GeminiModels
-
-
+from config.prompt import SUMMARY_FAILED, SUMMARY_SYSTEM_INSTRUCTION
+from services.prompt.compaction import compact_job_info
+import time
+from services.metrics.metrics import (
+    LLM_ERRORS,
+    LLM_REQUEST_SECONDS,
+    observe_llm_usage,
+)
+
+
+# google.genai takes most of a second to import, so it is only loaded once a
+# client is actually needed
 def init_gemini_client():
+    from google import genai
+
     load_dotenv()
     api_key = os.getenv("GEMINI_API_KEY")
     if api_key:
@@ -19,6 +29,8 @@ def init_gemini_client():
 
 # TODO: rotate models
 def ask_model(client) -> str:
+    from google.genai import types
+
     response = client.models.generate_content(
         model=GeminiModels.GEMINI_2_5_FLASH_LITE,
         contents="What is the meaning of life?",
@@ -32,94 +44,52 @@ def ask_model(client) -> str:
 async def generate_summaries_async(client, jobs: List[Job]) -> None:
     tasks = []
     for job in jobs:
-        task = generate_job_summary_async(client, job.str_no_summary(), job.link)
+        task = generate_job_summary_async(client, compact_job_info(job), job.link)
         tasks.append((job, task))
     results = await asyncio.gather(*[task for _, task in tasks], return_exceptions=True)
 
     for i, ((job, _), result) in enumerate(zip(tasks, results)):
         if isinstance(result, Exception):
+            LLM_ERRORS.labels("gemini").inc()
             print(f"Error generating summary for job {job.job_id}: {result}")
-            job.summary = "Summary generation failed"
+            job.summary = SUMMARY_FAILED
         else:
             job.summary = result
 
 
 async def generate_job_summary_async(client, job_info, apply_link=None) -> str:
-    prompt = f"""
-    You are a job summarization assistant.
-
-    I will give you detailed information about a job posting. Your task is to generate a compact, Telegram-ready job notification message. The message should be:
-
-    1. Scannable on mobile.
-    2. Concise (no more than ~150 words).
-    3. Include the following sections:
-    - Job Title & Focus
-    - Type & Hours
-    - Salary
-    - Company / Industry (optional)
-    - Key Responsibilities (2-3 bullets max)
-    - Key Requirements (2-3 bullets max)
-    - Bonus Skills (if relevant)
-    - Link / CTA (if provided)
-
-    Use short, clear bullet points where appropriate. Keep formatting readable and professional. Do not include unnecessary details.
-    IMPORTANT:
-    - Do NOT include any preamble, introduction, or phrases like "Here is a compact Telegram-ready job summary" or "Summary:". 
-    - Output ONLY the final Telegram message in the requested format.
-    - Start directly with the job title.
-    - Format it using plain text, no markdown.
-    - Output ONLY the final Telegram message in the requested format.
-
-    Here is the job information:
-
-    {job_info}
-    """
+    from google.genai import types
+
+    prompt = job_info
     if apply_link:
         prompt += f"\nApply here: {apply_link}"
 
     loop = asyncio.get_event_loop()
+    started = time.perf_counter()
     response = await loop.run_in_executor(
         None,
         lambda: client.models.generate_content(
             model=GeminiModels.GEMINI_2_5_FLASH_LITE,
             contents=prompt,
             config=types.GenerateContentConfig(
-                thinking_config=types.ThinkingConfig(thinking_budget=0)
+                system_instruction=SUMMARY_SYSTEM_INSTRUCTION,
+                thinking_config=types.ThinkingConfig(thinking_budget=0),
             ),
         ),
     )
+    LLM_REQUEST_SECONDS.labels("gemini").observe(time.perf_counter() - started)
+    usage = getattr(response, "usage_metadata", None)
+    if usage is not None:
+        observe_llm_usage(
+            "gemini", usage.prompt_token_count, usage.candidates_token_count
+        )
     return response.text
 
 
 def generate_job_summary(client, job_info, apply_link=None) -> str:
-    prompt = f"""
-    You are a job summarization assistant.
-
-    I will give you detailed information about a job posting. Your task is to generate a compact, Telegram-ready job notification message. The message should be:
-
-    1. Scannable on mobile.
-    2. Concise (no more than ~150 words).
-    3. Include the following sections:
-    - Job Title & Focus
-    - Type & Hours
-    - Salary
-    - Company / Industry (optional)
-    - Key Responsibilities (2-3 bullets max)
-    - Key Requirements (2-3 bullets max)
-    - Bonus Skills (if relevant)
-    - Link / CTA (if provided)
-
-    Use short, clear bullet points where appropriate. Keep formatting readable and professional. Do not include unnecessary details.
-    IMPORTANT:
-    - Do NOT include any preamble, introduction, or phrases like "Here is a compact Telegram-ready job summary" or "Summary:". 
-    - Start directly with the job title.
-    - Format it using plain text, no markdown.
-    - Output ONLY the final Telegram message in the requested format.
-
-    Here is the job information:
-
-    {job_info}
-    """
+    from google.genai import types
+
+    prompt = job_info
     if apply_link:
         prompt += f"\nApply here: {apply_link}"
 
@@ -127,7 +97,8 @@ def generate_job_summary(client, job_info, apply_link=None) -> str:
         model=GeminiModels.GEMINI_2_5_FLASH_LITE,
         contents=prompt,
         config=types.GenerateContentConfig(
-            thinking_config=types.ThinkingConfig(thinking_budget=0)
+            system_instruction=SUMMARY_SYSTEM_INSTRUCTION,
+            thinking_config=types.ThinkingConfig(thinking_budget=0),
         ),
     )
     return response.text
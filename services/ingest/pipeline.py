@@ -0,0 +1,107 @@
+import asyncio
+import time
+from typing import List
+from db.models.Job import Job
+from db.repository import archive_repository, job_repository
+from services.dedup.near_duplicates import (
+    copy_duplicate_summaries,
+    link_near_duplicates,
+    store_signatures,
+)
+from services.ingest.validation import filter_valid_jobs, quarantine_jobs
+from services.notifier.webhook import enqueue_new_jobs
+from services.percolator.matcher import notify_matches
+from services.google_ai.Gemini import (
+    init_gemini_client,
+    generate_summaries_async,
+)
+from services.metrics.metrics import DB_INSERT_BATCH_SIZE, PIPELINE_STAGE_SECONDS
+
+
+def ingest_jobs(session, jobs: List[Job], logger) -> List[Job]:
+    """
+    Store freshly scraped jobs: skip the ones already in the database,
+    quarantine the ones missing required fields, link near-duplicates,
+    summarize the rest and insert them in one commit together with their
+    webhook notification and saved-search matches. Nothing is written
+    before the summaries are generated, so no write transaction is held
+    open during the LLM calls.
+    Returns the inserted jobs.
+    """
+    logger.info("Filtering out jobs that already exist in the database...")
+    new_jobs: List[Job] = []
+    for job in jobs:
+        existing_job = job_repository.get_job_by_job_id(session, job.job_id)
+        if existing_job:
+            logger.warning(
+                "Job with job_id %s already exists. Skipping insertion.", job.job_id
+            )
+            continue
+        if archive_repository.is_archived(session, job.job_id):
+            logger.warning(
+                "Job with job_id %s is archived. Skipping insertion.", job.job_id
+            )
+            continue
+        new_jobs.append(job)
+
+    logger.info("Found %s new jobs to insert", len(new_jobs))
+    new_jobs, rejected = filter_valid_jobs(new_jobs, logger)
+    logger.info("%s new jobs passed validation", len(new_jobs))
+    logger.info("Checking for near-duplicate postings...")
+    with PIPELINE_STAGE_SECONDS.labels("dedup").time():
+        jobs_to_summarize, signatures = link_near_duplicates(session, new_jobs, logger)
+    logger.info(
+        "Found %s near-duplicates of existing jobs",
+        len(new_jobs) - len(jobs_to_summarize),
+    )
+
+    # Ends the read transaction before the slow part
+    session.commit()
+
+    if jobs_to_summarize:
+        logger.info("Generating job summaries asynchronously...")
+        start_time = time.time()
+        asyncGemini_client = init_gemini_client()
+        asyncio.run(generate_summaries_async(asyncGemini_client, jobs_to_summarize))
+        end_time = time.time()
+        PIPELINE_STAGE_SECONDS.labels("summarize").observe(end_time - start_time)
+        logger.info(
+            "Generated %s summaries in %.2f seconds",
+            len(jobs_to_summarize),
+            end_time - start_time,
+        )
+    copy_duplicate_summaries(new_jobs)
+
+    # A concurrent run or another worker may have stored some of these while
+    # the summaries were generated
+    stored = job_repository.get_existing_job_ids(session, [job.job_id for job in new_jobs])
+    if stored:
+        logger.warning(
+            "%s jobs were stored by another process. Skipping insertion.", len(stored)
+        )
+        signatures = [entry for entry in signatures if entry[0].job_id not in stored]
+
+    inserted: List[Job] = []
+    with PIPELINE_STAGE_SECONDS.labels("insert").time():
+        quarantine_jobs(session, rejected)
+        for job in new_jobs:
+            if job.job_id in stored:
+                continue
+            try:
+                job_repository.add_job(session, job)
+                inserted.append(job)
+            except Exception as e:
+                logger.error("Error adding job %s: %s", job.job_id, e)
+                continue
+        store_signatures(session, signatures)
+
+        # Queued in the same transaction so a notification exists exactly
+        # when its jobs do
+        enqueue_new_jobs(session, inserted)
+        with PIPELINE_STAGE_SECONDS.labels("percolate").time():
+            notify_matches(session, inserted, logger)
+        session.commit()
+
+    DB_INSERT_BATCH_SIZE.observe(len(inserted))
+    logger.info("Inserted %s jobs into the database.", len(inserted))
+    return inserted
@@ -0,0 +1,34 @@
+from typing import List
+from db.models.Job import Job
+from db.repository import quarantine_repository
+
+REQUIRED_FIELDS = ("title", "work_type", "salary", "hours_per_week", "job_overview")
+
+
+def validate_job(job: Job) -> str | None:
+    missing = [field for field in REQUIRED_FIELDS if not (getattr(job, field) or "").strip()]
+    if missing:
+        return f"Missing fields: {', '.join(missing)}"
+    return None
+
+
+def filter_valid_jobs(jobs: List[Job], logger):
+    """Split ``jobs`` into the valid ones and (job, reason) pairs for
+    ``quarantine_jobs``."""
+    valid: List[Job] = []
+    rejected = []
+    for job in jobs:
+        reason = validate_job(job)
+        if reason is None:
+            valid.append(job)
+            continue
+        logger.warning("Quarantining job %s: %s", job.job_id, reason)
+        rejected.append((job, reason))
+    return valid, rejected
+
+
+def quarantine_jobs(session, rejected):
+    for job, reason in rejected:
+        quarantine_repository.quarantine_job(session, job, reason)
+    if rejected:
+        quarantine_repository.prune_quarantine(session)
@@ -0,0 +1,331 @@
+import asyncio
+import bisect
+import re
+from config.job_index import (
+    JOB_INDEX_EXCLUDED_FIELDS,
+    JOB_INDEX_KEYWORD_CACHE_SIZE,
+    JOB_INDEX_LOAD_BATCH_SIZE,
+    JOB_INDEX_MAX_JOBS,
+)
+from db.models.Job import Job
+from db.repository import change_repository
+
+INDEXED_FIELDS = [
+    column.name
+    for column in Job.__table__.columns
+    if column.name not in JOB_INDEX_EXCLUDED_FIELDS
+]
+# Same characters the API keeps in search keywords, so a keyword without
+# whitespace can only ever match inside a single token
+TOKEN_PATTERN = re.compile(r"[\w.-]+")
+SORT_FIELDS = ("id", "job_id", "date_created")
+SEARCH_FIELDS = ("title", "job_overview")
+# Cannot occur in a token
+SUFFIX_SEPARATOR = "\x00"
+
+
+class JobRecord:
+    __slots__ = INDEXED_FIELDS
+
+    def __init__(self, **values):
+        for field in INDEXED_FIELDS:
+            setattr(self, field, values.get(field))
+
+    def to_dict(self) -> dict:
+        return {field: getattr(self, field) for field in INDEXED_FIELDS}
+
+
+def search_text(record: JobRecord, field) -> str:
+    return (getattr(record, field) or "").strip().lower()
+
+
+def record_tokens(record: JobRecord):
+    for field in SEARCH_FIELDS:
+        for token in set(TOKEN_PATTERN.findall(search_text(record, field))):
+            yield field, token
+
+
+def sort_key(field):
+    # NULLs sort first like they do in SQLite; id breaks ties
+    return lambda record: (
+        getattr(record, field) is not None,
+        getattr(record, field) or "",
+        record.id,
+    )
+
+
+def suffix_entries(token):
+    # Every suffix of the token, tagged with the token. Sorted, the tokens
+    # containing a keyword are the entries that start with it.
+    return [token[start:] + SUFFIX_SEPARATOR + token for start in range(len(token))]
+
+
+class Snapshot:
+    """Immutable state of the index; a new one replaces it after every change."""
+
+    def __init__(self, records: dict, tokens: dict, suffixes: dict, sorted_records: dict,
+                 dates: list, first_dated: int):
+        self.records = records
+        self.tokens = tokens
+        self.suffixes = suffixes
+        self.sorted = sorted_records
+        self.dates = dates
+        # Nulls sort first; date filters never match them
+        self.first_dated = first_dated
+        self.keyword_cache = {}
+
+    @classmethod
+    def build(cls, records: dict) -> "Snapshot":
+        tokens = {}
+        for job_id, record in records.items():
+            for token in record_tokens(record):
+                tokens.setdefault(token, set()).add(job_id)
+        suffixes = {field: [] for field in SEARCH_FIELDS}
+        for field, token in tokens:
+            suffixes[field].extend(suffix_entries(token))
+        for entries in suffixes.values():
+            entries.sort()
+        sorted_records = {
+            field: sorted(records.values(), key=sort_key(field))
+            for field in SORT_FIELDS
+        }
+        dates = [record.date_created or "" for record in sorted_records["date_created"]]
+        first_dated = sum(record.date_created is None for record in records.values())
+        return cls(records, tokens, suffixes, sorted_records, dates, first_dated)
+
+    def patch(self, updates: dict) -> "Snapshot":
+        """
+        The next snapshot with ``{job_id: JobRecord or None}`` applied. Only
+        the postings and suffix lists of the tokens the batch touches are
+        replaced, and the sorted arrays are patched in place of a re-sort.
+        """
+        records = dict(self.records)
+        changed = []
+        removed, added = {}, {}
+        for job_id, record in updates.items():
+            previous = records.pop(job_id, None)
+            if record is not None:
+                records[job_id] = record
+            if previous is None and record is None:
+                continue
+            changed.append((previous, record))
+            if previous is not None:
+                for token in record_tokens(previous):
+                    removed.setdefault(token, set()).add(job_id)
+            if record is not None:
+                for token in record_tokens(record):
+                    added.setdefault(token, set()).add(job_id)
+
+        tokens = dict(self.tokens)
+        suffixes = dict(self.suffixes)
+        copied = set()
+        for token in removed.keys() | added.keys():
+            token_removed = removed.get(token, set())
+            token_added = added.get(token, set())
+            if token_removed == token_added:
+                # Still in the same jobs after an update
+                continue
+            previous_ids = self.tokens.get(token, set())
+            job_ids = (previous_ids - token_removed) | token_added
+            if job_ids:
+                tokens[token] = job_ids
+            else:
+                del tokens[token]
+            if bool(previous_ids) == bool(job_ids):
+                continue
+
+            field, text = token
+            if field not in copied:
+                suffixes[field] = list(suffixes[field])
+                copied.add(field)
+            entries = suffixes[field]
+            for entry in suffix_entries(text):
+                if job_ids:
+                    bisect.insort(entries, entry)
+                else:
+                    del entries[bisect.bisect_left(entries, entry)]
+
+        sorted_records = {field: list(self.sorted[field]) for field in SORT_FIELDS}
+        dates = list(self.dates)
+        first_dated = self.first_dated
+        for previous, record in changed:
+            for field in SORT_FIELDS:
+                key = sort_key(field)
+                array = sorted_records[field]
+                if previous is not None:
+                    index = bisect.bisect_left(array, key(previous), key=key)
+                    del array[index]
+                    if field == "date_created":
+                        del dates[index]
+                if record is not None:
+                    index = bisect.bisect_left(array, key(record), key=key)
+                    array.insert(index, record)
+                    if field == "date_created":
+                        dates.insert(index, record.date_created or "")
+            if previous is not None and previous.date_created is None:
+                first_dated -= 1
+            if record is not None and record.date_created is None:
+                first_dated += 1
+
+        return Snapshot(records, tokens, suffixes, sorted_records, dates, first_dated)
+
+    def keyword_matches(self, keyword, field) -> set:
+        matches = self.keyword_cache.get((keyword, field))
+        if matches is None:
+            entries = self.suffixes[field]
+            matched_tokens = set()
+            for index in range(bisect.bisect_left(entries, keyword), len(entries)):
+                if not entries[index].startswith(keyword):
+                    break
+                matched_tokens.add(entries[index].rpartition(SUFFIX_SEPARATOR)[2])
+            matches = set()
+            for token in matched_tokens:
+                matches |= self.tokens[(field, token)]
+            if len(self.keyword_cache) >= JOB_INDEX_KEYWORD_CACHE_SIZE:
+                self.keyword_cache.clear()
+            self.keyword_cache[(keyword, field)] = matches
+        return matches
+
+
+class JobIndex:
+    """
+    In-memory copy of the jobs table (without raw_text) for the API.
+
+    Records use ``__slots__`` and are kept in per-field sorted arrays plus an
+    inverted index from (field, token) to job ids for the searched fields.
+    Keywords are looked up through a sorted list of token suffixes per field.
+    The index is loaded once at startup and then follows the job_changes
+    feed, patching the snapshot with each batch, so it catches up a few
+    moments after every ingest. Readers always see a complete snapshot.
+    """
+
+    def __init__(self, session_factory, max_jobs=JOB_INDEX_MAX_JOBS):
+        self.session_factory = session_factory
+        self.max_jobs = max_jobs
+        self.snapshot = None
+        self.seq = 0
+        self.ready = False
+
+    def load(self, logger):
+        with self.session_factory() as session:
+            # Read the position first so nothing committed during the load
+            # is missed; changes applied twice end in the same state
+            seq = change_repository.get_latest_seq(session)
+            records = {}
+            query = (
+                session.query(*[getattr(Job, field) for field in INDEXED_FIELDS])
+                .order_by(Job.id)
+                .yield_per(JOB_INDEX_LOAD_BATCH_SIZE)
+            )
+            for row in query:
+                record = JobRecord(**row._mapping)
+                records[record.job_id] = record
+                if len(records) > self.max_jobs:
+                    logger.warning(
+                        "More than %s jobs stored, job index disabled", self.max_jobs
+                    )
+                    return False
+
+        self.snapshot = Snapshot.build(records)
+        self.seq = seq
+        self.ready = True
+        logger.info("Job index loaded with %s jobs (change %s)", len(records), seq)
+        return True
+
+    def catch_up(self, logger) -> int:
+        applied = 0
+        while True:
+            with self.session_factory() as session:
+                changes = change_repository.get_changes(
+                    session, self.seq, JOB_INDEX_LOAD_BATCH_SIZE
+                )
+                updates = {
+                    change.job_id: (
+                        JobRecord(
+                            **{field: getattr(job, field) for field in INDEXED_FIELDS}
+                        )
+                        if job is not None
+                        else None
+                    )
+                    for change, job in changes
+                }
+            if not changes:
+                return applied
+            self.apply(updates)
+            self.seq = changes[-1][0].seq
+            applied += len(changes)
+            if len(self.snapshot.records) > self.max_jobs:
+                logger.warning(
+                    "More than %s jobs stored, job index disabled", self.max_jobs
+                )
+                self.ready = False
+                return applied
+
+    def apply(self, updates: dict):
+        """Replace the snapshot with one that has ``{job_id: JobRecord or None}`` applied."""
+        self.snapshot = self.snapshot.patch(updates)
+
+    async def follow(self, change_feed, logger, wait_seconds=30):
+        # Stops once catch_up has disabled the index; waiting on the feed
+        # from a position that is never advanced would return immediately
+        while self.ready:
+            try:
+                head = await change_feed.wait_for(self.seq, wait_seconds)
+                if head > self.seq:
+                    applied = await asyncio.to_thread(self.catch_up, logger)
+                    logger.info("Job index applied %s changes", applied)
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error("Failed to update job index: %s", e)
+                await asyncio.sleep(wait_seconds)
+
+    def query(
+        self, salary=None, posted_after=None, posted_before=None,
+        sort_by="date_created", order="desc",
+    ) -> list:
+        """Jobs matching the filters of /api/jobs, in the requested order."""
+        snapshot = self.snapshot
+        if sort_by == "date_created" or not sort_by:
+            records = snapshot.sorted["date_created"]
+            start = bisect.bisect_left(snapshot.dates, posted_after) if posted_after else 0
+            end = (
+                bisect.bisect_right(snapshot.dates, posted_before)
+                if posted_before
+                else len(records)
+            )
+            if posted_after or posted_before:
+                start = max(start, snapshot.first_dated)
+            records = records[start:end]
+        else:
+            records = [
+                record
+                for record in snapshot.sorted[sort_by]
+                if not (posted_after or posted_before)
+                or (
+                    record.date_created is not None
+                    and (not posted_after or record.date_created >= posted_after)
+                    and (not posted_before or record.date_created <= posted_before)
+                )
+            ]
+
+        if salary:
+            salary = salary.lower()
+            records = [
+                record
+                for record in records
+                if record.salary is not None and salary in record.salary.lower()
+            ]
+        if order == "desc" or not sort_by:
+            records = records[::-1]
+        return records
+
+    def matches_keywords(self, record: JobRecord, keywords, fields=SEARCH_FIELDS) -> bool:
+        for keyword in keywords:
+            for field in fields:
+                if any(char.isspace() for char in keyword):
+                    if keyword in search_text(record, field):
+                        return True
+                elif record.job_id in self.snapshot.keyword_matches(keyword, field):
+                    return True
+        return False
@@ -0,0 +1,23 @@
+import uuid
+from contextvars import ContextVar
+
+run_id: ContextVar[str | None] = ContextVar("run_id", default=None)
+request_id: ContextVar[str | None] = ContextVar("request_id", default=None)
+
+
+def new_correlation_id() -> str:
+    return uuid.uuid4().hex[:16]
+
+
+def set_run_id(value: str | None = None) -> str:
+    value = value or new_correlation_id()
+    run_id.set(value)
+    return value
+
+
+def set_request_id(value: str | None = None):
+    return request_id.set(value or new_correlation_id())
+
+
+def reset_request_id(token):
+    request_id.reset(token)
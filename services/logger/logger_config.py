@@ -1,8 +1,141 @@
+import atexit
+import json
 import logging
 import logging.handlers
+import os
+import queue
+import random
 import sys
+import threading
 from pathlib import Path
 from typing import Optional
+from services.logger import context
+
+TEXT_FORMAT = "%(asctime)s [%(levelname)8s] %(name)s [run %(run_id)s] [%(filename)s:%(lineno)d] %(funcName)s(): %(message)s"
+CONSOLE_FORMAT = "%(asctime)s [%(levelname)-8s] %(name)s [run %(run_id)s]: %(message)s"
+
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+_listener: Optional[logging.handlers.QueueListener] = None
+_lock = threading.Lock()
+
+
+class ContextFilter(logging.Filter):
+    def filter(self, record):
+        record.run_id = context.run_id.get()
+        record.request_id = context.request_id.get()
+        return True
+
+
+class SamplingFilter(logging.Filter):
+    """
+    Drops a share of high-volume records. Only records logged with
+    ``extra={"sampled": True}`` are sampled; everything else passes.
+    """
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.rate = rate
+
+    def filter(self, record):
+        if self.rate >= 1 or not getattr(record, "sampled", False):
+            return True
+        return random.random() < self.rate
+
+
+class JsonFormatter(logging.Formatter):
+    def format(self, record):
+        entry = {
+            "ts": self.formatTime(record),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+            "module": record.module,
+            "line": record.lineno,
+            "run_id": getattr(record, "run_id", None),
+            "request_id": getattr(record, "request_id", None),
+        }
+        if record.exc_info:
+            entry["exc_info"] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+class TextFormatter(logging.Formatter):
+    def format(self, record):
+        # A copy, the JSON formatter of another handler reads the same record
+        record = logging.makeLogRecord(record.__dict__)
+        record.run_id = getattr(record, "run_id", None) or "-"
+        return super().format(record)
+
+
+def _build_handlers(json_format: bool) -> list[logging.Handler]:
+    file_formatter = JsonFormatter() if json_format else TextFormatter(TEXT_FORMAT)
+
+    # Console handler
+    ch = logging.StreamHandler(sys.stdout)
+    ch.setLevel(logging.INFO)
+    ch.setFormatter(TextFormatter(CONSOLE_FORMAT))
+
+    # File handler
+    fh_info = logging.handlers.RotatingFileHandler(
+        "logs/app.log",
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    fh_info.setLevel(logging.INFO)
+    fh_info.setFormatter(file_formatter)
+
+    fh_error = logging.handlers.RotatingFileHandler(
+        "logs/errors.log",
+        maxBytes=10 * 1024 * 1024,
+        backupCount=5,
+        encoding="utf-8",
+    )
+    fh_error.setLevel(logging.ERROR)
+    fh_error.setFormatter(file_formatter)
+
+    return [ch, fh_info, fh_error]
+
+
+def _get_queue_handler(json_format: bool) -> logging.handlers.QueueHandler:
+    # One listener thread owns the real handlers for the whole process, so
+    # callers only pay for putting the record on the queue
+    global _queue_handler, _listener
+    with _lock:
+        if _queue_handler is None:
+            log_queue = queue.SimpleQueue()
+            handlers = _build_handlers(json_format)
+            _queue_handler = logging.handlers.QueueHandler(log_queue)
+            _queue_handler.setLevel(min(handler.level for handler in handlers))
+            _listener = logging.handlers.QueueListener(
+                log_queue, *handlers, respect_handler_level=True
+            )
+            _listener.start()
+            atexit.register(stop_logging)
+        return _queue_handler
+
+
+def stop_logging():
+    global _listener
+    with _lock:
+        if _listener is not None:
+            _listener.stop()
+            _listener = None
+
+
+def _restart_listener_after_fork():
+    # A forked child inherits the queue handler but not the listener thread,
+    # so without a listener of its own its records would never be written
+    global _lock, _listener
+    _lock = threading.Lock()
+    if _listener is not None:
+        _listener = logging.handlers.QueueListener(
+            _listener.queue, *_listener.handlers, respect_handler_level=True
+        )
+        _listener.start()
+
+
+os.register_at_fork(after_in_child=_restart_listener_after_fork)
 
 
 class Logger:
@@ -13,43 +146,18 @@ class Logger:
         self.logger.setLevel(getattr(logging, level.upper(), logging.DEBUG))
 
         if not self.logger.handlers:
-            # Console handler
-            ch = logging.StreamHandler(sys.stdout)
-            ch.setLevel(logging.INFO)
-            ch.setFormatter(
-                logging.Formatter("%(asctime)s [%(levelname)-8s] %(name)s: %(message)s")
-            )
-
-            # File handler
-            fh_info = logging.handlers.RotatingFileHandler(
-                "logs/app.log",
-                maxBytes=10 * 1024 * 1024,
-                backupCount=5,
-                encoding="utf-8",
-            )
-            fh_info.setLevel(logging.INFO)
-            fh_info.setFormatter(
-                logging.Formatter(
-                    "%(asctime)s [%(levelname)8s] %(name)s [%(filename)s:%(lineno)d] %(funcName)s(): %(message)s"
-                )
-            )
+            use_queue = os.getenv("LOG_ASYNC", "true").lower() in ("1", "true", "yes")
+            json_format = os.getenv("LOG_FORMAT", "text").lower() == "json"
+            sample_rate = float(os.getenv("LOG_SAMPLE_RATE", 1.0))
 
-            fh_error = logging.handlers.RotatingFileHandler(
-                "logs/errors.log",
-                maxBytes=10 * 1024 * 1024,
-                backupCount=5,
-                encoding="utf-8",
-            )
-            fh_error.setLevel(logging.ERROR)
-            fh_error.setFormatter(
-                logging.Formatter(
-                    "%(asctime)s [%(levelname)8s] %(name)s [%(filename)s:%(lineno)d] %(funcName)s(): %(message)s"
-                )
-            )
+            self.logger.addFilter(ContextFilter())
+            self.logger.addFilter(SamplingFilter(sample_rate))
 
-            self.logger.addHandler(ch)
-            self.logger.addHandler(fh_info)
-            self.logger.addHandler(fh_error)
+            if use_queue:
+                self.logger.addHandler(_get_queue_handler(json_format))
+            else:
+                for handler in _build_handlers(json_format):
+                    self.logger.addHandler(handler)
 
     def get(self) -> logging.Logger:
         return self.logger
@@ -58,4 +166,4 @@ class Logger:
         lvl = getattr(logging, level.upper(), None)
         if lvl:
             self.logger.setLevel(lvl)
-            self.logger.info(f"Log level set to {level.upper()}")
+            self.logger.info("Log level set to %s", level.upper())
@@ -0,0 +1,141 @@
+import os
+import time
+from dotenv import load_dotenv
+from prometheus_client import (
+    CONTENT_TYPE_LATEST,
+    REGISTRY,
+    Counter,
+    Gauge,
+    Histogram,
+    generate_latest,
+    push_to_gateway,
+    write_to_textfile,
+)
+from sqlalchemy import event
+
+HTTP_FETCH_SECONDS = Histogram(
+    "olj_http_fetch_seconds",
+    "Time spent downloading pages from onlinejobs.ph",
+    ["page"],
+)
+HTTP_FETCH_RESPONSES = Counter(
+    "olj_http_fetch_responses_total",
+    "Responses from onlinejobs.ph by status code",
+    ["page", "status"],
+)
+EGRESS_IDENTITY_RATE = Gauge(
+    "olj_egress_identity_rate",
+    "Current adaptive request rate per egress identity (requests/second)",
+    ["identity"],
+)
+EGRESS_COOLDOWNS = Counter(
+    "olj_egress_cooldowns_total",
+    "Times an egress identity was benched after being blocked",
+    ["identity"],
+)
+PARSE_SECONDS = Histogram(
+    "olj_parse_seconds",
+    "Time spent parsing a downloaded page",
+    ["page"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+PIPELINE_STAGE_SECONDS = Histogram(
+    "olj_pipeline_stage_seconds",
+    "Duration of each stage of a scraper run",
+    ["stage"],
+    buckets=(1, 5, 15, 30, 60, 120, 300, 600, 1200, 1800, 3600),
+)
+LLM_REQUEST_SECONDS = Histogram(
+    "olj_llm_request_seconds",
+    "Latency of LLM summary requests",
+    ["provider"],
+    buckets=(0.25, 0.5, 1, 2, 4, 8, 16, 32, 64),
+)
+LLM_TOKENS = Counter(
+    "olj_llm_tokens_total",
+    "Tokens consumed by LLM summary requests",
+    ["provider", "kind"],
+)
+LLM_ERRORS = Counter(
+    "olj_llm_errors_total",
+    "Failed LLM summary requests",
+    ["provider"],
+)
+DB_QUERY_SECONDS = Histogram(
+    "olj_db_query_seconds",
+    "Database statement execution time",
+    ["operation"],
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+DB_INSERT_BATCH_SIZE = Histogram(
+    "olj_db_insert_batch_size",
+    "Number of jobs inserted per scraper run",
+    buckets=(0, 1, 5, 10, 25, 50, 100, 250, 500, 1000),
+)
+API_REQUEST_SECONDS = Histogram(
+    "olj_api_request_seconds",
+    "API request latency",
+    ["method", "route", "status"],
+)
+
+
+def observe_fetch(page, started, response):
+    HTTP_FETCH_SECONDS.labels(page).observe(time.perf_counter() - started)
+    if response is None:
+        status = "error"
+    elif getattr(response, "from_cache", False):
+        status = "304"
+    else:
+        status = str(response.status_code)
+    HTTP_FETCH_RESPONSES.labels(page, status).inc()
+
+
+def observe_llm_usage(provider, prompt_tokens, completion_tokens):
+    if prompt_tokens:
+        LLM_TOKENS.labels(provider, "prompt").inc(prompt_tokens)
+    if completion_tokens:
+        LLM_TOKENS.labels(provider, "completion").inc(completion_tokens)
+
+
+def instrument_engine(engine):
+    @event.listens_for(engine, "before_cursor_execute")
+    def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        conn.info.setdefault("query_start_time", []).append(time.perf_counter())
+
+    @event.listens_for(engine, "after_cursor_execute")
+    def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+        started = conn.info["query_start_time"].pop()
+        operation = statement.lstrip().split(None, 1)[0].upper() if statement else "UNKNOWN"
+        DB_QUERY_SECONDS.labels(operation).observe(time.perf_counter() - started)
+
+    @event.listens_for(engine, "handle_error")
+    def _handle_error(context):
+        started = context.connection.info.get("query_start_time") if context.connection else None
+        if started:
+            started.pop()
+
+    return engine
+
+
+def render_latest():
+    return generate_latest(REGISTRY), CONTENT_TYPE_LATEST
+
+
+def export_batch_metrics(logger, job="olj_scraper"):
+    load_dotenv()
+    textfile = os.getenv("METRICS_TEXTFILE")
+    gateway = os.getenv("METRICS_PUSHGATEWAY")
+
+    if textfile:
+        try:
+            write_to_textfile(textfile, REGISTRY)
+            logger.info("Metrics written to %s", textfile)
+        except Exception as e:
+            logger.error("Failed to write metrics textfile: %s", e)
+
+    if gateway:
+        try:
+            push_to_gateway(gateway, job=job, registry=REGISTRY)
+            logger.info("Metrics pushed to %s", gateway)
+        except Exception as e:
+            logger.error("Failed to push metrics: %s", e)
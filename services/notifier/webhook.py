@@ -0,0 +1,139 @@
+import contextvars
+import hashlib
+import hmac
+import json
+import os
+import threading
+import time
+import uuid
+from datetime import datetime
+from typing import List
+from dotenv import load_dotenv
+import requests
+from db.models.Job import Job
+from db.repository import outbox_repository
+
+JOBS_CREATED = "jobs.created"
+MAX_EVENTS_PER_REQUEST = 100
+IN_RUN_RETRIES = 3
+IN_RUN_BACKOFF_SECONDS = 2
+MAX_RETRY_DELAY_SECONDS = 60 * 60
+
+
+def job_payload(job: Job) -> dict:
+    return {
+        "job_id": job.job_id,
+        "title": job.title,
+        "link": job.link,
+        "summary": job.summary,
+    }
+
+
+def enqueue_new_jobs(session, jobs: List[Job]):
+    # Reposts share the original's summary and have already been announced
+    payload = [job_payload(job) for job in jobs if job.duplicate_of is None]
+    if payload:
+        outbox_repository.add_event(session, JOBS_CREATED, json.dumps(payload))
+
+
+def sign(secret, timestamp, body: bytes) -> str:
+    message = f"{timestamp}.".encode("utf-8") + body
+    return "sha256=" + hmac.new(secret.encode("utf-8"), message, hashlib.sha256).hexdigest()
+
+
+def build_body(entries) -> dict:
+    # All pending jobs.created events are merged into one list so the
+    # receiver gets a single notification however many runs it missed
+    jobs = []
+    events = []
+    for entry in entries:
+        data = json.loads(entry.payload)
+        if entry.event == JOBS_CREATED:
+            jobs.extend(data)
+        else:
+            events.append({"event": entry.event, "data": data})
+    if jobs:
+        events.insert(0, {"event": JOBS_CREATED, "data": jobs})
+    return {
+        "delivery_id": uuid.uuid4().hex,
+        "sent_at": datetime.now().isoformat(),
+        "events": events,
+    }
+
+
+def post_signed(url, secret, body: dict, timeout=10):
+    data = json.dumps(body, ensure_ascii=False).encode("utf-8")
+    headers = {"Content-Type": "application/json"}
+    if secret:
+        timestamp = str(int(time.time()))
+        headers["X-OLJ-Timestamp"] = timestamp
+        headers["X-OLJ-Signature"] = sign(secret, timestamp, data)
+    return requests.post(url, data=data, headers=headers, timeout=timeout)
+
+
+def deliver_pending(SessionLocal, logger) -> int:
+    """
+    Send every due outbox entry to WEBHOOK_URL in signed, coalesced batches.
+    Failed batches are retried a few times with backoff and otherwise left in
+    the outbox for the next run. Returns the number of delivered entries.
+    """
+    load_dotenv()
+    url = os.environ.get("WEBHOOK_URL", "0.0.0.0:8080/webhook/trigger")
+    secret = os.environ.get("WEBHOOK_SECRET")
+    claimed_by = uuid.uuid4().hex
+    delivered = 0
+
+    with SessionLocal() as session:
+        while True:
+            entries = outbox_repository.claim_pending(
+                session, claimed_by, MAX_EVENTS_PER_REQUEST
+            )
+            if not entries:
+                break
+
+            body = build_body(entries)
+            error = None
+            for attempt in range(IN_RUN_RETRIES):
+                if attempt:
+                    time.sleep(IN_RUN_BACKOFF_SECONDS * 2 ** (attempt - 1))
+                try:
+                    response = post_signed(url, secret, body)
+                except Exception as e:
+                    error = str(e)
+                    continue
+                if 200 <= response.status_code < 300:
+                    error = None
+                    break
+                error = f"Status code: {response.status_code}"
+
+            if error is None:
+                outbox_repository.mark_delivered(session, entries)
+                delivered += len(entries)
+                continue
+
+            attempts = max(entry.attempts for entry in entries) + 1
+            retry_in = min(60 * 2 ** attempts, MAX_RETRY_DELAY_SECONDS)
+            outbox_repository.mark_failed(session, entries, error, retry_in)
+            logger.error(
+                "Failed to send webhook notification (%s), retrying in %ss",
+                error,
+                retry_in,
+            )
+            break
+
+        outbox_repository.prune_delivered(session)
+
+    if delivered:
+        logger.info("Webhook notification sent for %s outbox entries", delivered)
+    return delivered
+
+
+def start_delivery(SessionLocal, logger) -> threading.Thread:
+    # Runs in a copy of the caller's context so its records keep the run_id
+    thread = threading.Thread(
+        target=contextvars.copy_context().run,
+        args=(deliver_pending, SessionLocal, logger),
+        name="webhook-delivery",
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,146 @@
+import bisect
+import json
+import re
+from typing import List
+from db.models.Job import Job
+from db.models.Subscription import Subscription
+from db.repository import outbox_repository, subscription_repository
+from services.notifier.webhook import job_payload
+from utils.bands import monthly_usd
+
+SUBSCRIPTION_MATCHED = "subscription.matched"
+# Words joined by . or - stay one token ("node.js", "full-time"), trailing
+# punctuation does not ("python.")
+TOKEN_PATTERN = re.compile(r"[\w+#]+(?:[.-][\w+#]+)*")
+# Separates title and overview so a phrase never matches across them
+FIELD_SEPARATOR = "\x1f"
+
+
+def tokenize(text) -> List[str]:
+    return TOKEN_PATTERN.findall((text or "").lower())
+
+
+def parse_keywords(keywords) -> List[str]:
+    """Keywords as space-joined token phrases, e.g. "web developer"."""
+    phrases = []
+    for keyword in (keywords or "").split(","):
+        tokens = tokenize(keyword)
+        if tokens:
+            phrases.append(" ".join(tokens))
+    return phrases
+
+
+class CompiledSubscription:
+    __slots__ = ("id", "name", "phrases", "work_type", "min_salary", "max_salary")
+
+    def __init__(self, subscription: Subscription):
+        self.id = subscription.id
+        self.name = subscription.name
+        self.phrases = parse_keywords(subscription.keywords)
+        self.work_type = (subscription.work_type or "").strip().lower() or None
+        self.min_salary = subscription.min_salary
+        self.max_salary = subscription.max_salary
+
+    def anchor(self):
+        # The longest token is usually the rarest, so it filters best
+        tokens = [token for phrase in self.phrases for token in phrase.split()]
+        return max(tokens, key=len) if tokens else None
+
+    def matches(self, text, work_type, salary) -> bool:
+        if self.work_type and self.work_type != work_type:
+            return False
+        if self.min_salary is not None or self.max_salary is not None:
+            if salary is None:
+                return False
+            if self.min_salary is not None and salary < self.min_salary:
+                return False
+            if self.max_salary is not None and salary > self.max_salary:
+                return False
+        return all(f" {phrase} " in text for phrase in self.phrases)
+
+
+class SubscriptionMatcher:
+    """
+    Index of the subscriptions themselves, so a new job is tested against
+    all of them at once.
+
+    Subscriptions with keywords are filed under one anchor token; a job
+    only looks up the tokens it contains, so its cost depends on the job's
+    length rather than on the number of subscriptions. Subscriptions
+    without keywords are kept sorted by minimum salary and only the ones
+    the job's salary reaches are checked.
+    """
+
+    def __init__(self, subscriptions: List[Subscription]):
+        self.by_anchor = {}
+        unanchored = []
+        for subscription in subscriptions:
+            compiled = CompiledSubscription(subscription)
+            anchor = compiled.anchor()
+            if anchor is None:
+                unanchored.append(compiled)
+            else:
+                self.by_anchor.setdefault(anchor, []).append(compiled)
+        unanchored.sort(key=lambda item: item.min_salary or 0.0)
+        self.unanchored = unanchored
+        self.unanchored_min = [item.min_salary or 0.0 for item in unanchored]
+
+    def match(self, job: Job) -> List[CompiledSubscription]:
+        title_tokens = tokenize(job.title)
+        overview_tokens = tokenize(job.job_overview)
+        text = f" {' '.join(title_tokens)} {FIELD_SEPARATOR} {' '.join(overview_tokens)} "
+        work_type = (job.work_type or "").strip().lower() or None
+        salary = monthly_usd(job.salary, job.hours_per_week)
+
+        candidates = []
+        for token in set(title_tokens) | set(overview_tokens):
+            candidates.extend(self.by_anchor.get(token, ()))
+        if salary is None:
+            # Only subscriptions without a salary floor can match
+            candidates.extend(self.unanchored[: bisect.bisect_right(self.unanchored_min, 0.0)])
+        else:
+            candidates.extend(
+                self.unanchored[: bisect.bisect_right(self.unanchored_min, salary)]
+            )
+        return [
+            subscription
+            for subscription in candidates
+            if subscription.matches(text, work_type, salary)
+        ]
+
+
+def notify_matches(session, jobs: List[Job], logger) -> int:
+    """
+    Queue one webhook event per subscription that matched any of ``jobs``,
+    in the caller's transaction. Returns the number of matches.
+    """
+    jobs = [job for job in jobs if job.duplicate_of is None]
+    if not jobs:
+        return 0
+    subscriptions = subscription_repository.get_subscriptions(session, active_only=True)
+    if not subscriptions:
+        return 0
+
+    matcher = SubscriptionMatcher(subscriptions)
+    matched = {}
+    for job in jobs:
+        for subscription in matcher.match(job):
+            matched.setdefault(subscription.id, (subscription, []))[1].append(job)
+
+    for subscription, subscription_jobs in matched.values():
+        outbox_repository.add_event(
+            session,
+            SUBSCRIPTION_MATCHED,
+            json.dumps(
+                {
+                    "subscription_id": subscription.id,
+                    "name": subscription.name,
+                    "jobs": [job_payload(job) for job in subscription_jobs],
+                }
+            ),
+        )
+    count = sum(len(subscription_jobs) for _, subscription_jobs in matched.values())
+    logger.info(
+        "Matched new jobs to %s subscriptions (%s matches)", len(matched), count
+    )
+    return count
@@ -0,0 +1,156 @@
+import math
+import re
+from config.prompt import (
+    BOILERPLATE_PATTERNS,
+    CHARS_PER_TOKEN,
+    PRIMARY_SECTION_PATTERN,
+    SECONDARY_SECTION_PATTERN,
+    SUMMARY_PROMPT_TOKEN_BUDGET,
+)
+from db.models.Job import Job
+
+BOILERPLATE = [re.compile(pattern, re.IGNORECASE) for pattern in BOILERPLATE_PATTERNS]
+PRIMARY_SECTION = re.compile(PRIMARY_SECTION_PATTERN, re.IGNORECASE)
+SECONDARY_SECTION = re.compile(SECONDARY_SECTION_PATTERN, re.IGNORECASE)
+BULLET = re.compile(r"^([-*•●▪‣◦]|\d+[.)])\s*")
+SENTENCE_END = re.compile(r"(?<=[.!?])\s+(?=[A-Z0-9\"'(])")
+EMPHASIS = re.compile(r"\b(must|required|requirement|need|only|minimum|at least)\b", re.IGNORECASE)
+
+# Scores used to decide what stays when the budget is tight
+INTRO_SCORE = 3.0
+PRIMARY_SCORE = 2.5
+SECONDARY_SCORE = 1.5
+OTHER_SCORE = 1.0
+EMPHASIS_BONUS = 0.5
+POSITION_DECAY = 0.05
+
+
+def estimate_tokens(text) -> int:
+    return math.ceil(len(text or "") / CHARS_PER_TOKEN)
+
+
+def is_boilerplate(line) -> bool:
+    return any(pattern.match(line) for pattern in BOILERPLATE)
+
+
+def is_header(line) -> bool:
+    return len(line) <= 60 and line.endswith(":") and not BULLET.match(line)
+
+
+def clean_lines(text) -> list:
+    """
+    Normalize whitespace, drop boilerplate lines and drop lines that repeat
+    an earlier one (ads often paste the same paragraph or section twice).
+    """
+    lines = []
+    seen = set()
+    for line in (text or "").splitlines():
+        line = " ".join(line.split())
+        if not line or is_boilerplate(line):
+            continue
+        key = BULLET.sub("", line).lower().rstrip(".!")
+        if key in seen and not is_header(line):
+            continue
+        seen.add(key)
+        lines.append(line)
+    # Headers left without lines once their repeated section is gone
+    return [
+        line
+        for index, line in enumerate(lines)
+        if not is_header(line)
+        or (index + 1 < len(lines) and not is_header(lines[index + 1]))
+    ]
+
+
+def score_units(lines) -> list:
+    """
+    Split the lines into units (bullets, or sentences of prose lines) and
+    score how much each is worth keeping: the intro and the
+    responsibilities/requirements sections rank first, and earlier
+    entries of a section rank above later ones.
+    """
+    units = []
+    section_score = INTRO_SCORE
+    position = 0
+    for line_index, line in enumerate(lines):
+        if is_header(line):
+            if PRIMARY_SECTION.search(line):
+                section_score = PRIMARY_SCORE
+            elif SECONDARY_SECTION.search(line):
+                section_score = SECONDARY_SCORE
+            else:
+                section_score = OTHER_SCORE
+            position = 0
+            continue
+
+        parts = [line] if BULLET.match(line) else SENTENCE_END.split(line)
+        for part in parts:
+            score = section_score - POSITION_DECAY * position
+            if EMPHASIS.search(part):
+                score += EMPHASIS_BONUS
+            units.append((score, line_index, part))
+            position += 1
+        if section_score == INTRO_SCORE:
+            # Only the opening paragraph counts as the intro
+            section_score = OTHER_SCORE
+    return units
+
+
+def fit_to_budget(text, budget) -> str:
+    lines = clean_lines(text)
+    compacted = "\n".join(lines)
+    if estimate_tokens(compacted) <= budget:
+        return compacted
+
+    units = score_units(lines)
+    kept = set()
+    remaining = budget
+    ranked = sorted(range(len(units)), key=lambda index: (-units[index][0], index))
+    for index in ranked:
+        # +1 for the separator joining it to its neighbours
+        cost = estimate_tokens(units[index][2]) + 1
+        if cost <= remaining:
+            kept.add(index)
+            remaining -= cost
+
+    kept_lines = {}
+    for index in sorted(kept):
+        _, line_index, part = units[index]
+        kept_lines.setdefault(line_index, []).append(part)
+
+    output = []
+    for line_index, line in enumerate(lines):
+        if line_index in kept_lines:
+            output.append(" ".join(kept_lines[line_index]))
+        elif is_header(line) and any(
+            later in kept_lines
+            for later in range(line_index + 1, next_header(lines, line_index))
+        ):
+            output.append(line)
+    return "\n".join(output)
+
+
+def next_header(lines, index) -> int:
+    for later in range(index + 1, len(lines)):
+        if is_header(lines[later]):
+            return later
+    return len(lines)
+
+
+def compact_job_info(job: Job, budget=SUMMARY_PROMPT_TOKEN_BUDGET) -> str:
+    """
+    Job details for a summary prompt: the structured fields as they are and
+    the overview cleaned up and cut down to what fits in ``budget`` tokens.
+    """
+    fields = "\n".join(
+        f"{label}: {value}"
+        for label, value in (
+            ("Title", job.title),
+            ("Type", job.work_type),
+            ("Salary", job.salary),
+            ("Hours per week", job.hours_per_week),
+        )
+        if value
+    )
+    overview = fit_to_budget(job.job_overview, max(0, budget - estimate_tokens(fields)))
+    return f"{fields}\nOverview:\n{overview}" if overview else fields
@@ -0,0 +1,62 @@
+from datetime import datetime, timedelta
+from sqlalchemy import text
+from config.retention import (
+    ARCHIVE_AFTER_DAYS,
+    ARCHIVE_BATCH_SIZE,
+    ARCHIVE_CLOSED_AFTER_DAYS,
+    VACUUM_MIN_FREE_RATIO,
+)
+from db.repository import archive_repository
+
+
+def archive_expired_jobs(logger, SessionLocal) -> int:
+    """
+    Move postings older than ARCHIVE_AFTER_DAYS, or closed more than
+    ARCHIVE_CLOSED_AFTER_DAYS ago, to jobs_archive in batches of
+    ARCHIVE_BATCH_SIZE, then refresh the query planner statistics.
+    """
+    now = datetime.now()
+    posted_before = (now - timedelta(days=ARCHIVE_AFTER_DAYS)).isoformat()
+    closed_before = (now - timedelta(days=ARCHIVE_CLOSED_AFTER_DAYS)).isoformat()
+    logger.info(
+        "Archiving jobs posted before %s or closed before %s...",
+        posted_before[:10],
+        closed_before[:10],
+    )
+
+    archived = 0
+    with SessionLocal() as session:
+        while True:
+            ids = archive_repository.get_expired_job_ids(
+                session, posted_before, closed_before, ARCHIVE_BATCH_SIZE
+            )
+            if not ids:
+                break
+            archived += archive_repository.archive_jobs(session, ids)
+            session.commit()
+        engine = session.get_bind()
+
+    logger.info("Archived %s jobs.", archived)
+    if archived:
+        optimize_database(logger, engine)
+    return archived
+
+
+def optimize_database(logger, engine):
+    # VACUUM cannot run inside a transaction
+    with engine.connect().execution_options(isolation_level="AUTOCOMMIT") as conn:
+        conn.execute(text("ANALYZE"))
+        logger.info("Updated query planner statistics")
+
+        # Turso manages storage itself; only the local file is vacuumed
+        if engine.url.drivername != "sqlite":
+            return
+        page_count = conn.execute(text("PRAGMA page_count")).scalar() or 0
+        free_pages = conn.execute(text("PRAGMA freelist_count")).scalar() or 0
+        if page_count and free_pages / page_count >= VACUUM_MIN_FREE_RATIO:
+            conn.execute(text("VACUUM"))
+            logger.info(
+                "Vacuumed the database, %s of %s pages were free",
+                free_pages,
+                page_count,
+            )
@@ -1,4 +1,6 @@
 import argparse
+from config.export import EXPORT_DIR
+from config.refresh import REFRESH_DEFAULT_LIMIT
 
 
 def init_cli_args():
@@ -8,10 +10,75 @@ def init_cli_args():
     parser.add_argument(
         "--test", action="store_true", help="Run in test mode (scrape only 3 jobs)"
     )
+    parser.add_argument(
+        "--no-cache",
+        action="store_true",
+        help="Disable the local HTTP cache for job detail pages",
+    )
+    parser.add_argument(
+        "--cleanup-nulls",
+        action="store_true",
+        help="Delete stored jobs with missing fields after the run",
+    )
+    parser.add_argument(
+        "--archive",
+        action="store_true",
+        help="Move expired and closed postings to the archive table after the run",
+    )
+    parser.add_argument(
+        "--refresh",
+        action="store_true",
+        help="Re-check stored jobs for edits and closed postings instead of scraping new ones",
+    )
+    parser.add_argument(
+        "--refresh-limit",
+        type=int,
+        default=REFRESH_DEFAULT_LIMIT,
+        help=f"Maximum number of jobs to re-check in refresh mode (default {REFRESH_DEFAULT_LIMIT})",
+    )
+    parser.add_argument(
+        "--coordinator",
+        action="store_true",
+        help="Discover job listings and put them on the shared scrape queue",
+    )
+    parser.add_argument(
+        "--worker",
+        action="store_true",
+        help="Claim jobs from the shared scrape queue, scrape and store them",
+    )
+    parser.add_argument(
+        "--workers",
+        type=int,
+        default=1,
+        help="Number of local worker processes to start in worker mode (default 1)",
+    )
+    parser.add_argument("--worker-id", help="Worker name used for queue leases")
+    parser.add_argument(
+        "--exit-when-idle",
+        action="store_true",
+        help="Stop workers once the scrape queue is empty",
+    )
+    parser.add_argument(
+        "--export-dir",
+        default=EXPORT_DIR,
+        help=f"Output directory of scripts.export_parquet (default {EXPORT_DIR})",
+    )
+    parser.add_argument(
+        "--full-export",
+        action="store_true",
+        help="Rewrite every partition instead of only the ones changed since the last export",
+    )
+    parser.add_argument(
+        "--skip-raw-text",
+        action="store_true",
+        help="Do not export raw_text",
+    )
 
     args = parser.parse_args()
 
     if args.dev and args.prod:
         parser.error("Cannot specify both --dev and --prod")
+    if args.coordinator and args.worker:
+        parser.error("Cannot specify both --coordinator and --worker")
 
     return args
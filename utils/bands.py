@@ -0,0 +1,66 @@
+import re
+from config.stats import (
+    DEFAULT_HOURS_PER_WEEK,
+    HOURS_BANDS,
+    PHP_PER_USD,
+    SALARY_BANDS,
+    UNSPECIFIED,
+    WEEKS_PER_MONTH,
+)
+
+NUMBER_PATTERN = re.compile(r"\d[\d,]*(?:\.\d+)?")
+PHP_PATTERN = re.compile(r"php|₱|peso")
+
+
+def parse_hours(hours_per_week) -> float | None:
+    match = NUMBER_PATTERN.search(hours_per_week or "")
+    if match is None:
+        return None
+    return float(match.group().replace(",", ""))
+
+
+def monthly_usd(salary, hours_per_week=None) -> float | None:
+    """
+    Rough monthly pay in USD for free-form salaries such as
+    "$1,500 - $2,200/month", "PHP 25,000" or "$5/hour". Ranges use their
+    midpoint and salaries without a period are taken as monthly.
+    """
+    text = (salary or "").lower()
+    amounts = [
+        float(number.replace(",", "")) for number in NUMBER_PATTERN.findall(text)
+    ]
+    if not amounts:
+        return None
+    amount = sum(amounts[:2]) / len(amounts[:2])
+
+    if "hour" in text or "/hr" in text:
+        hours = parse_hours(hours_per_week) or DEFAULT_HOURS_PER_WEEK
+        amount *= hours * WEEKS_PER_MONTH
+    elif "week" in text:
+        amount *= WEEKS_PER_MONTH
+    elif "year" in text or "annual" in text:
+        amount /= 12
+
+    if PHP_PATTERN.search(text):
+        amount /= PHP_PER_USD
+    return amount
+
+
+def salary_band(salary, hours_per_week=None) -> str:
+    amount = monthly_usd(salary, hours_per_week)
+    if amount is None:
+        return UNSPECIFIED
+    for lower, label in SALARY_BANDS:
+        if amount >= lower:
+            return label
+    return UNSPECIFIED
+
+
+def hours_band(hours_per_week) -> str:
+    hours = parse_hours(hours_per_week)
+    if hours is None:
+        return UNSPECIFIED
+    for lower, label in HOURS_BANDS:
+        if hours >= lower:
+            return label
+    return UNSPECIFIED
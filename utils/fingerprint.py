@@ -0,0 +1,12 @@
+import hashlib
+
+FINGERPRINT_FIELDS = ("title", "work_type", "salary", "hours_per_week", "job_overview")
+
+
+def job_fingerprint(job) -> str:
+    hasher = hashlib.sha256()
+    for field in FINGERPRINT_FIELDS:
+        value = getattr(job, field) or ""
+        hasher.update(" ".join(value.split()).encode("utf-8"))
+        hasher.update(b"\x1f")
+    return hasher.hexdigest()
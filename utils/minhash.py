@@ -0,0 +1,62 @@
+import hashlib
+import random
+import re
+import struct
+from config.dedup import (
+    DEDUP_BANDS,
+    DEDUP_NUM_PERM,
+    DEDUP_ROWS,
+    DEDUP_SEED,
+    DEDUP_SHINGLE_SIZE,
+)
+
+_MERSENNE_PRIME = (1 << 61) - 1
+_rng = random.Random(DEDUP_SEED)
+_PERMUTATIONS = [
+    (_rng.randrange(1, _MERSENNE_PRIME), _rng.randrange(0, _MERSENNE_PRIME))
+    for _ in range(DEDUP_NUM_PERM)
+]
+
+
+def _hash64(value: bytes) -> int:
+    return int.from_bytes(hashlib.blake2b(value, digest_size=8).digest(), "little")
+
+
+def shingles(text: str, size: int = DEDUP_SHINGLE_SIZE) -> set:
+    words = re.findall(r"\w+", text.lower())
+    if len(words) < size:
+        return {" ".join(words)} if words else set()
+    return {" ".join(words[i : i + size]) for i in range(len(words) - size + 1)}
+
+
+def minhash_signature(text: str) -> list[int] | None:
+    hashes = [_hash64(shingle.encode("utf-8")) for shingle in shingles(text)]
+    if not hashes:
+        return None
+    return [
+        min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in _PERMUTATIONS
+    ]
+
+
+def estimate_similarity(left: list[int], right: list[int]) -> float:
+    matches = sum(1 for a, b in zip(left, right) if a == b)
+    return matches / len(left)
+
+
+def lsh_buckets(signature: list[int]) -> list[tuple[int, str]]:
+    buckets = []
+    for band in range(DEDUP_BANDS):
+        rows = signature[band * DEDUP_ROWS : (band + 1) * DEDUP_ROWS]
+        digest = hashlib.blake2b(
+            struct.pack(f"<{len(rows)}Q", *rows), digest_size=8
+        ).hexdigest()
+        buckets.append((band, digest))
+    return buckets
+
+
+def pack_signature(signature: list[int]) -> bytes:
+    return struct.pack(f"<{len(signature)}Q", *signature)
+
+
+def unpack_signature(data: bytes) -> list[int]:
+    return list(struct.unpack(f"<{len(data) // 8}Q", data))
@@ -1,35 +1,37 @@
-from db.engine.engine import engine_init_local, engine_init_remote
-from db.session.session import create_session_factory
 from db.models.Job import Job
-from sqlalchemy import or_
+from db.repository import change_repository, dedup_repository, stats_repository
+from sqlalchemy import delete, or_
 
 
-def remove_null_entries(logger, env="dev"):
+def remove_null_entries(logger, SessionLocal):
     logger.info("Removing null entries from the database...")
 
-    if env == "prod":
-        logger.info("Using remote database")
-        engine = engine_init_remote()
-    else:
-        logger.info("Using local database")
-        engine = engine_init_local()
-
-    SessionLocal = create_session_factory(engine)
-
     with SessionLocal() as session:
-        deleted_count = (
-            session.query(Job)
-            .filter(
-                or_(
-                    Job.title.is_(None),
-                    Job.work_type.is_(None),
-                    Job.salary.is_(None),
-                    Job.hours_per_week.is_(None),
-                    Job.job_overview.is_(None),
+        # Matches the WHERE clause of the ix_jobs_missing_fields partial index
+        deleted = (
+            session.execute(
+                delete(Job)
+                .where(
+                    or_(
+                        Job.title.is_(None),
+                        Job.work_type.is_(None),
+                        Job.salary.is_(None),
+                        Job.hours_per_week.is_(None),
+                        Job.job_overview.is_(None),
+                    )
+                )
+                .returning(
+                    Job.job_id,
+                    *[getattr(Job, column) for column in stats_repository.SOURCE_COLUMNS],
                 )
             )
-            .delete(synchronize_session=False)
+            .all()
+        )
+        change_repository.record_changes(
+            session, [row[0] for row in deleted], change_repository.OP_DELETE
         )
+        stats_repository.remove_jobs(session, [row[1:] for row in deleted])
+        dedup_repository.remove_signatures(session, [row[0] for row in deleted])
 
         session.commit()
-        logger.info(f"Removed {deleted_count} null entries successfully.")
+        logger.info("Removed %s null entries successfully.", len(deleted))